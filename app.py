@@ -3,13 +3,13 @@ India Compliance Pain Tracker - Streamlit Dashboard
 Simple, fast, actionable compliance intelligence.
 """
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import json
+import sqlite3
 
-from src.database import get_posts, get_stats, init_db, DB_PATH
+from src.database import (
+    get_posts, get_post_sources, get_spikes, get_tag_cooccurrence, read_only_uri, DB_PATH, SNAPSHOT_PATH
+)
 import os
 
 
@@ -21,12 +21,34 @@ st.set_page_config(
 )
 
 
-# Initialize database if it doesn't exist
-if not os.path.exists(DB_PATH):
+# Read the snapshot collect.py publishes: immutable, so reads take no locks
+# and never wait on a running collector. Fall back to the live database where
+# no snapshot has been published (always the case on Streamlit Cloud, which
+# only gets the committed compliance_data.db). The dashboard never writes:
+# tables the collector hasn't created yet are treated as empty.
+if os.path.exists(SNAPSHOT_PATH):
+    db_uri = read_only_uri(SNAPSHOT_PATH)
+    data_version = os.path.getmtime(SNAPSHOT_PATH)
+elif os.path.exists(DB_PATH):
+    db_uri = read_only_uri(DB_PATH, immutable=False)
+    data_version = None
+else:
     st.warning("Database not found. Run `python collect.py` to collect data first.")
     st.stop()
 
-init_db()
+# pandas, numpy and plotly are imported only once there is a database to show;
+# the "no database" page above renders without them
+import numpy as np
+import pandas as pd
+
+from src.tag_matrix import build_tag_matrix, tag_mask, tag_counts, tag_share
+
+
+# Tags counted as pain signals
+PAIN_TAGS = ['PortalIssues', 'Deadlines', 'Negative']
+
+# Most common tags shown in the co-occurrence heatmap
+HEATMAP_TAGS = 12
 
 
 # Title and description
@@ -59,8 +81,7 @@ with st.sidebar:
     # Source filter
     st.subheader("Source")
     # Get available sources from database dynamically
-    all_posts = get_posts()
-    available_sources = sorted(set(p['source'] for p in all_posts)) if all_posts else []
+    available_sources = get_post_sources(db_path=db_uri)
     source_options = ["All"] + available_sources
     source_filter = st.selectbox(
         "Select source",
@@ -70,9 +91,14 @@ with st.sidebar:
     # Tag filter
     st.subheader("Tags")
     tag_filter = st.text_input(
-        "Tag contains (comma = OR)",
+        "Tags (comma-separated)",
         placeholder="e.g., GST, PortalIssues"
     )
+    tag_match_all = st.radio(
+        "Match",
+        options=["Any tag (OR)", "All tags (AND)"],
+        horizontal=True
+    ) == "All tags (AND)"
 
     # Text search
     st.subheader("Text Search")
@@ -81,6 +107,14 @@ with st.sidebar:
         placeholder="e.g., portal down"
     )
 
+    # Near-duplicate handling
+    st.subheader("Duplicates")
+    count_clusters = st.checkbox(
+        "Count near-duplicates once",
+        value=True,
+        help="Posts repeated across feeds with slightly different titles/URLs are counted as one"
+    )
+
     st.divider()
 
     # Refresh button
@@ -90,18 +124,53 @@ with st.sidebar:
 
 # Fetch data
 @st.cache_data(ttl=300)  # Cache for 5 minutes
-def load_data(start, end, source):
-    """Load posts from database with caching."""
+def load_data(start, end, source, db_uri, version):
+    """Load posts from database with caching (a new snapshot `version` reloads)."""
     posts = get_posts(
         start_date=datetime.combine(start, datetime.min.time()),
         end_date=datetime.combine(end, datetime.max.time()),
-        source=None if source == "All" else source
+        source=None if source == "All" else source,
+        db_path=db_uri
     )
     return posts
 
 
+@st.cache_data(ttl=300)
+def load_tag_matrix(start, end, source, db_uri, version):
+    """Posts x tags boolean matrix for load_data's posts (same row order)."""
+    posts = load_data(start, end, source, db_uri, version)
+    return build_tag_matrix([post['tags'] for post in posts])
+
+
+@st.cache_data(ttl=300)
+def load_spikes(window, db_uri, version):
+    """Active spike alerts over the last `window` days."""
+    try:
+        return get_spikes(window=window, db_path=db_uri)
+    except sqlite3.OperationalError:
+        # Database from before spike detection existed
+        return []
+
+
+@st.cache_data(ttl=300)
+def load_cooccurrence(start, end, source, unique, db_uri, version):
+    """Tag pair counts over the selected dates and source."""
+    try:
+        return get_tag_cooccurrence(
+            start_date=start,
+            end_date=end,
+            source=None if source == "All" else source,
+            unique=unique,
+            db_path=db_uri
+        )
+    except sqlite3.OperationalError:
+        # Database from before co-occurrence counts existed
+        return {}
+
+
 # Load posts
-posts = load_data(start_date, end_date, source_filter)
+posts = load_data(start_date, end_date, source_filter, db_uri, data_version)
+tag_matrix, tag_vocab = load_tag_matrix(start_date, end_date, source_filter, db_uri, data_version)
 
 # Convert to DataFrame
 if posts:
@@ -109,29 +178,38 @@ if posts:
     df['created_at'] = pd.to_datetime(df['created_at'], format='mixed', errors='coerce')
     df['date'] = df['created_at'].dt.date
 
+    # df keeps its RangeIndex, so index labels are tag_matrix row numbers
+    keep = np.ones(len(df), dtype=bool)
+
     # Apply tag filter
     if tag_filter:
         search_tags = [t.strip() for t in tag_filter.split(',')]
-        df = df[df['tags'].apply(
-            lambda tags: any(tag in tags for tag in search_tags)
-        )]
+        keep &= tag_mask(tag_matrix, tag_vocab, search_tags, match_all=tag_match_all)
 
     # Apply text filter
     if text_filter:
-        mask = (
+        keep &= (
             df['title'].str.contains(text_filter, case=False, na=False) |
             df['text'].str.contains(text_filter, case=False, na=False)
-        )
-        df = df[mask]
+        ).to_numpy()
+
+    df = df[keep]
 else:
     df = pd.DataFrame()
 
+# Aggregations count one post per near-duplicate cluster if enabled
+if count_clusters and not df.empty:
+    stats_df = df.drop_duplicates('canonical_id')
+else:
+    stats_df = df
+stats_rows = stats_df.index.to_numpy()
+
 
 # KPIs
 col1, col2, col3, col4 = st.columns(4)
 
 with col1:
-    st.metric("Total Posts", len(df))
+    st.metric("Total Posts", len(stats_df))
 
 with col2:
     unique_authors = df['author'].nunique() if not df.empty else 0
@@ -142,14 +220,8 @@ with col3:
     st.metric("Sources", unique_sources)
 
 with col4:
-    if not df.empty:
-        all_tags = []
-        for tags in df['tags']:
-            all_tags.extend(tags)
-        pain_tags = ['PortalIssues', 'Deadlines', 'Negative']
-        pain_count = sum(1 for tag in all_tags if tag in pain_tags)
-        total_tags = len(all_tags)
-        pain_pct = (pain_count / total_tags * 100) if total_tags > 0 else 0
+    if not stats_df.empty:
+        pain_pct = tag_share(tag_matrix, tag_vocab, PAIN_TAGS, stats_rows) * 100
         st.metric("Pain Signal %", f"{pain_pct:.1f}%")
     else:
         st.metric("Pain Signal %", "0%")
@@ -157,15 +229,50 @@ with col4:
 st.divider()
 
 
+# Active alerts (all posts, independent of the filters above)
+st.subheader("🚨 Active Alerts")
+alert_window = st.radio(
+    "Window",
+    options=[1, 3, 7],
+    format_func=lambda days: "Today" if days == 1 else f"Last {days} days",
+    horizontal=True
+)
+alerts = load_spikes(alert_window, db_uri, data_version)
+
+if alerts:
+    alerts_df = pd.DataFrame(alerts)
+    alerts_df['tag'] = alerts_df['tag'].replace('*', 'All tags')
+    alerts_df['source'] = alerts_df['source'].replace('*', 'All sources')
+    st.dataframe(
+        alerts_df[['tag', 'source', 'observed', 'expected', 'zscore']],
+        column_config={
+            "tag": "Tag",
+            "source": "Source",
+            "observed": "Posts",
+            "expected": st.column_config.NumberColumn("Expected", format="%.1f"),
+            "zscore": st.column_config.NumberColumn("Std. devs above normal", format="%.1f")
+        },
+        hide_index=True,
+        use_container_width=True
+    )
+else:
+    st.caption("No unusual activity: every tag and source is within its normal daily range.")
+
+st.divider()
+
+
 # Charts section
 if not df.empty:
+    import plotly.express as px
+    import plotly.graph_objects as go
+
     col_left, col_right = st.columns(2)
 
     with col_left:
         st.subheader("📈 Daily Mentions Trend")
 
         # Daily counts
-        daily_counts = df.groupby('date').size().reset_index(name='count')
+        daily_counts = stats_df.groupby('date').size().reset_index(name='count')
         daily_counts['date'] = pd.to_datetime(daily_counts['date'])
 
         fig_trend = px.line(
@@ -185,21 +292,18 @@ if not df.empty:
     with col_right:
         st.subheader("🏷️ Top Tags")
 
-        # Count tags
-        all_tags = []
-        for tags in df['tags']:
-            all_tags.extend(tags)
-
-        if all_tags:
-            tag_counts = pd.Series(all_tags).value_counts().head(10)
+        # Count tags (column sums of the tag matrix)
+        top_tags = pd.Series(tag_counts(tag_matrix, tag_vocab, stats_rows), dtype='int64')
+        top_tags = top_tags[top_tags > 0].sort_values(ascending=False, kind='stable').head(10)
 
+        if not top_tags.empty:
             # Color coding for pain tags
-            colors = ['#ff6b6b' if tag in ['PortalIssues', 'Deadlines', 'Negative']
-                     else '#4ecdc4' for tag in tag_counts.index]
+            colors = ['#ff6b6b' if tag in PAIN_TAGS
+                     else '#4ecdc4' for tag in top_tags.index]
 
             fig_tags = go.Figure([go.Bar(
-                x=tag_counts.values,
-                y=tag_counts.index,
+                x=top_tags.values,
+                y=top_tags.index,
                 orientation='h',
                 marker_color=colors
             )])
@@ -214,6 +318,41 @@ if not df.empty:
         else:
             st.info("No tags found in filtered data.")
 
+    st.subheader("🔥 Tag Co-occurrence")
+    pair_counts = load_cooccurrence(start_date, end_date, source_filter, count_clusters, db_uri, data_version)
+    tag_totals = {tag_a: count for (tag_a, tag_b), count in pair_counts.items() if tag_a == tag_b}
+    heatmap_tags = sorted(tag_totals, key=tag_totals.get, reverse=True)[:HEATMAP_TAGS]
+
+    if len(heatmap_tags) > 1:
+        heat_mode = st.radio(
+            "Show",
+            options=["Posts with both tags", "% of row tag's posts"],
+            horizontal=True
+        )
+        heat = pd.DataFrame(0.0, index=heatmap_tags, columns=heatmap_tags)
+        for (tag_a, tag_b), count in pair_counts.items():
+            if tag_a in heat.index and tag_b in heat.index and tag_a != tag_b:
+                heat.loc[tag_a, tag_b] = heat.loc[tag_b, tag_a] = count
+        if heat_mode != "Posts with both tags":
+            heat = heat.div(pd.Series(tag_totals)[heatmap_tags], axis=0) * 100
+        # The diagonal (posts per tag) would swamp the colour scale
+        heat.values[np.diag_indices(len(heatmap_tags))] = np.nan
+
+        fig_heat = px.imshow(
+            heat,
+            text_auto='.0f',
+            color_continuous_scale='Reds',
+            aspect='auto',
+            labels={'color': 'Posts' if heat_mode == "Posts with both tags" else '% of row tag'}
+        )
+        fig_heat.update_layout(height=450, margin=dict(l=0, r=0, t=0, b=0))
+        st.plotly_chart(fig_heat, use_container_width=True)
+        st.caption("Selected dates and source"
+                   + (", near-duplicates counted once" if count_clusters else "")
+                   + "; the tag/text filters are not applied.")
+    else:
+        st.info("Not enough tagged posts in this date range for co-occurrence.")
+
     st.divider()
 
     # Data table
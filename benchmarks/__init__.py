@@ -0,0 +1 @@
+# India Compliance Pain Tracker - Benchmarks
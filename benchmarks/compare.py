@@ -0,0 +1,68 @@
+"""
+Compare two benchmark reports and flag regressions.
+
+Usage:
+    python -m benchmarks.compare baseline.json current.json [--threshold 1.2]
+
+Exits with status 1 if any benchmark got slower than threshold x baseline.
+"""
+import argparse
+import json
+import sys
+from typing import Dict, List, Optional, Tuple
+
+
+def load_results(path: str) -> Dict[Tuple[str, int], Dict]:
+    """Load a report keyed by (benchmark name, corpus size)."""
+    with open(path) as f:
+        report = json.load(f)
+    return {(r['name'], r['size']): r for r in report['results']}
+
+
+def compare(baseline: Dict, current: Dict, threshold: float) -> List[Dict]:
+    """Return per-benchmark ratios of current vs baseline best time."""
+    rows = []
+    for key in sorted(set(baseline) & set(current), key=lambda k: (k[1], k[0])):
+        base, cur = baseline[key], current[key]
+        # Compare per-op cost so runs with different op counts stay comparable
+        base_cost = base['per_op_us'] or base['best']
+        cur_cost = cur['per_op_us'] or cur['best']
+        ratio = cur_cost / base_cost if base_cost else 1.0
+        rows.append({
+            'name': key[0],
+            'size': key[1],
+            'baseline': base_cost,
+            'current': cur_cost,
+            'ratio': ratio,
+            'regression': ratio > threshold
+        })
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Print a comparison table and return the exit status."""
+    parser = argparse.ArgumentParser(description="Compare benchmark reports")
+    parser.add_argument('baseline', help="Baseline report JSON")
+    parser.add_argument('current', help="Current report JSON")
+    parser.add_argument('--threshold', type=float, default=1.2,
+                        help="Slowdown ratio that counts as a regression")
+    args = parser.parse_args(argv)
+
+    rows = compare(load_results(args.baseline), load_results(args.current), args.threshold)
+
+    print(f"{'benchmark':<24} {'size':>10} {'baseline':>12} {'current':>12} {'ratio':>7}")
+    for row in rows:
+        flag = '  REGRESSION' if row['regression'] else ''
+        print(f"{row['name']:<24} {row['size']:>10,} {row['baseline']:>12.3f} "
+              f"{row['current']:>12.3f} {row['ratio']:>7.2f}{flag}")
+
+    regressions = [r for r in rows if r['regression']]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) above {args.threshold:.2f}x")
+        return 1
+    print("\nNo regressions.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
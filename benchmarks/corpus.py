@@ -0,0 +1,165 @@
+"""
+Seeded synthetic corpus generator for benchmarks.
+Builds realistic Reddit/RSS posts from the real tagger vocabularies.
+"""
+import random
+import string
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional
+
+from src.tagger import TOPIC_KEYWORDS, PAIN_KEYWORDS
+
+
+# Mirrors TARGET_SUBREDDITS / RSS_FEEDS without importing praw or feedparser
+SUBREDDITS = ['IndiaTax', 'IndiaStartups']
+
+FEEDS = {
+    'TaxGuru': 'https://taxguru.in/feed',
+    'Income Tax India': 'https://incometaxindia.gov.in/_layouts/15/Dit/Pages/Rss.aspx?List=Latest+Tax+Updates',
+    'SEBI': 'https://www.sebi.gov.in/sebirss.xml'
+}
+
+# Roughly the source mix of the production database (~93% Reddit)
+SOURCE_WEIGHTS = {
+    'Reddit': 93,
+    'TaxGuru': 5,
+    'Income Tax India': 1,
+    'SEBI': 1
+}
+
+SEBI_PATHS = [
+    'media-and-notifications/press-releases', 'legal/circulars',
+    'enforcement/orders', 'legal/regulations', 'enforcement'
+]
+
+TAXGURU_SECTIONS = [
+    'goods-and-service-tax', 'income-tax', 'company-law', 'custom-duty', 'sebi'
+]
+
+# Filler vocabulary that does not trigger any tag on its own
+FILLER_WORDS = [
+    'my', 'father', 'business', 'account', 'received', 'month', 'last',
+    'year', 'please', 'help', 'anyone', 'know', 'how', 'should', 'what',
+    'the', 'for', 'with', 'this', 'that', 'from', 'savings', 'salary',
+    'client', 'invoice', 'payment', 'bank', 'notice', 'query', 'advice',
+    'startup', 'founder', 'company', 'freelance', 'office', 'consultant'
+]
+
+TITLE_TEMPLATES = [
+    '{topic} {pain} since morning',
+    'Anyone else facing {pain} on {topic}?',
+    '{topic} query - {filler}',
+    'Help needed with {topic} ({pain})',
+    'Update on {topic}: {filler}',
+    '{filler} {filler} {topic}'
+]
+
+AUTHORS = ['CA Sandeep Kanoi', 'Team TaxGuru', 'CBDT', 'SEBI']
+
+
+def _pick_keyword(rng: random.Random, vocabulary: Dict[str, List[str]]) -> str:
+    """Pick a random keyword from a tag vocabulary."""
+    tag = rng.choice(list(vocabulary))
+    return rng.choice(vocabulary[tag])
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    """Build a sentence of filler words."""
+    return ' '.join(rng.choice(FILLER_WORDS) for _ in range(words))
+
+
+def _body(rng: random.Random, paragraphs: int) -> str:
+    """Build post body text sprinkled with topic and pain keywords."""
+    parts = []
+    for _ in range(paragraphs):
+        words = [rng.choice(FILLER_WORDS) for _ in range(rng.randint(15, 45))]
+        if rng.random() < 0.7:
+            words.insert(rng.randrange(len(words)), _pick_keyword(rng, TOPIC_KEYWORDS))
+        if rng.random() < 0.5:
+            words.insert(rng.randrange(len(words)), _pick_keyword(rng, PAIN_KEYWORDS))
+        parts.append(' '.join(words).capitalize() + '.')
+    return '\n\n'.join(parts)
+
+
+def _title(rng: random.Random) -> str:
+    """Build a post title from a template."""
+    template = rng.choice(TITLE_TEMPLATES)
+    return template.format(
+        topic=_pick_keyword(rng, TOPIC_KEYWORDS).upper(),
+        pain=_pick_keyword(rng, PAIN_KEYWORDS),
+        filler=_sentence(rng, rng.randint(2, 5))
+    )
+
+
+def _slug(title: str) -> str:
+    """Turn a title into a URL slug."""
+    cleaned = ''.join(c if c.isalnum() else ' ' for c in title.lower())
+    return '-'.join(cleaned.split())[:80]
+
+
+def _reddit_id(rng: random.Random) -> str:
+    """Generate a base36 Reddit submission id."""
+    alphabet = string.digits + string.ascii_lowercase
+    return ''.join(rng.choice(alphabet) for _ in range(7))
+
+
+def generate_posts(
+    count: int,
+    seed: int = 42,
+    days_back: int = 180,
+    now: Optional[datetime] = None
+) -> Iterator[Dict]:
+    """
+    Yield `count` synthetic posts, deterministic for a given seed.
+    Posts use the keyword arguments of insert_post (minus tags) and are
+    not sorted by date.
+    """
+    rng = random.Random(seed)
+    now = now or datetime(2025, 11, 9, 12, 0, 0)
+    sources = list(SOURCE_WEIGHTS)
+    weights = list(SOURCE_WEIGHTS.values())
+    span = days_back * 86400
+
+    for i in range(count):
+        source = rng.choices(sources, weights)[0]
+        title = _title(rng)
+        created_at = now - timedelta(seconds=rng.randrange(span))
+
+        if source == 'Reddit':
+            subreddit = rng.choice(SUBREDDITS)
+            reddit_id = f"{_reddit_id(rng)}{i:x}"
+            yield {
+                'post_id': f"reddit_{reddit_id}",
+                'source': 'Reddit',
+                'title': title,
+                'text': _body(rng, rng.randint(1, 4)),
+                'author': f"user_{rng.randrange(count // 4 + 1)}",
+                'url': f"https://reddit.com/r/{subreddit}/comments/{reddit_id}/{_slug(title)}/",
+                'score': int(rng.paretovariate(1.2)) - 1,
+                'created_at': created_at,
+                'subreddit': subreddit
+            }
+        else:
+            if source == 'SEBI':
+                link = f"https://www.sebi.gov.in/{rng.choice(SEBI_PATHS)}/{_slug(title)}_{i}.html"
+            elif source == 'TaxGuru':
+                link = f"https://taxguru.in/{rng.choice(TAXGURU_SECTIONS)}/{_slug(title)}-{i}.html"
+            else:
+                link = f"https://incometaxindia.gov.in/Lists/Latest%20News/DispForm.aspx?ID={i}"
+            summary = f"<p>{_body(rng, 1)}</p>"
+            yield {
+                'post_id': f"rss_{i:032x}",
+                'source': source,
+                'title': title,
+                'text': summary,
+                'author': rng.choice(AUTHORS),
+                'url': link,
+                'score': 0,
+                'created_at': created_at,
+                'subreddit': None
+            }
+
+
+def generate_corpus(count: int, seed: int = 42, days_back: int = 180) -> List[Dict]:
+    """Generate a list of synthetic posts."""
+    return list(generate_posts(count, seed=seed, days_back=days_back))
@@ -0,0 +1,243 @@
+"""
+Offline stand-ins for PRAW and feedparser.
+Serve synthetic corpus posts through the same interfaces the collectors use.
+"""
+import importlib.machinery
+import io
+import sys
+import types
+from typing import Dict, Iterable, List, Optional
+from xml.sax.saxutils import escape
+
+
+class FakeSubmission:
+    """Minimal stand-in for praw.models.Submission."""
+
+    def __init__(self, post: Dict):
+        self.id = post['post_id'].split('_', 1)[1]
+        self.title = post['title']
+        self.selftext = post['text']
+        self.author = post['author']
+        self.permalink = post['url'].replace('https://reddit.com', '')
+        self.score = post['score']
+        self.created_utc = post['created_at'].timestamp()
+        self.subreddit = types.SimpleNamespace(display_name=post['subreddit'])
+
+
+class FakeStream:
+    """Stand-in for SubredditStream that also sees submissions pushed later."""
+
+    # PRAW replays this many recent submissions when a stream starts
+    REPLAY = 100
+
+    def __init__(self, subreddit: 'FakeSubreddit'):
+        self._subreddit = subreddit
+
+    def submissions(self, pause_after: Optional[int] = None, skip_existing: bool = False):
+        """Yield new submissions oldest first; yield None when idle if pause_after is set."""
+        seen = set()
+        initial = self._subreddit.submissions()
+        if skip_existing:
+            seen.update(s.id for s in initial)
+        while True:
+            fresh = [s for s in reversed(self._subreddit.submissions()[:self.REPLAY]) if s.id not in seen]
+            for submission in fresh:
+                seen.add(submission.id)
+                yield submission
+            if not fresh and pause_after is not None:
+                yield None
+
+
+class FakeSubreddit:
+    """Minimal stand-in for praw.models.Subreddit (supports 'a+b' multireddits)."""
+
+    def __init__(self, reddit: 'FakeReddit', name: str):
+        self._reddit = reddit
+        self.display_name = name
+        self._names = [n.lower() for n in name.split('+')]
+        self.stream = FakeStream(self)
+
+    def submissions(self) -> List[FakeSubmission]:
+        """All submissions in these subreddits, newest first."""
+        found = []
+        for name in self._names:
+            found.extend(self._reddit._by_subreddit.get(name, []))
+        return sorted(found, key=lambda s: s.created_utc, reverse=True)
+
+    def new(self, limit: Optional[int] = 100) -> Iterable[FakeSubmission]:
+        """Yield submissions newest first, like Subreddit.new()."""
+        found = self.submissions()[:limit]
+        # PRAW fetches listings 100 items per request
+        for _ in range(max(1, -(-len(found) // 100))):
+            self._reddit._spend()
+        return iter(found)
+
+
+class FakeAuth:
+    """Stand-in for praw's Auth exposing rate-limit headroom."""
+
+    def __init__(self, remaining: Optional[float] = None):
+        self.limits = {'remaining': remaining, 'reset_timestamp': None, 'used': 0}
+
+
+class FakeReddit:
+    """Minimal stand-in for praw.Reddit backed by synthetic posts."""
+
+    # Mirrors the limit praw applies to one /api/info request
+    INFO_LIMIT = 100
+
+    def __init__(self, posts: Iterable[Dict] = (), rate_limit: Optional[float] = None, **kwargs):
+        self._by_subreddit: Dict[str, List[FakeSubmission]] = {}
+        self._by_id: Dict[str, FakeSubmission] = {}
+        self.auth = FakeAuth(rate_limit)
+        self.requests = 0
+        for post in posts:
+            self.push(post)
+
+    def push(self, post: Dict) -> None:
+        """Publish a Reddit post; streams pick it up on their next poll."""
+        if post['source'] == 'Reddit':
+            submission = FakeSubmission(post)
+            self._by_subreddit.setdefault(post['subreddit'].lower(), []).append(submission)
+            self._by_id[submission.id] = submission
+
+    def _spend(self) -> None:
+        """Account for one API request against the rate limit."""
+        self.requests += 1
+        limits = self.auth.limits
+        limits['used'] += 1
+        if limits['remaining'] is not None:
+            limits['remaining'] -= 1
+
+    def subreddit(self, name: str) -> FakeSubreddit:
+        """Return a subreddit view, like Reddit.subreddit()."""
+        return FakeSubreddit(self, name)
+
+    def info(self, fullnames: Iterable[str] = ()) -> Iterable[FakeSubmission]:
+        """Look up submissions by t3_ fullname, one request per 100, like Reddit.info()."""
+        fullnames = list(fullnames)
+        for start in range(0, len(fullnames), self.INFO_LIMIT):
+            self._spend()
+            for fullname in fullnames[start:start + self.INFO_LIMIT]:
+                submission = self._by_id.get(fullname.split('_', 1)[1])
+                if submission is not None:
+                    yield submission
+
+    def bump_scores(self, amount: int = 1) -> None:
+        """Simulate votes arriving on every submission."""
+        for submission in self._by_id.values():
+            submission.score += amount
+
+
+class FeedEntry(dict):
+    """Dict with attribute access, like feedparser.FeedParserDict."""
+
+    def __getattr__(self, key):
+        try:
+            return self[key]
+        except KeyError:
+            raise AttributeError(key)
+
+
+def build_entry(post: Dict) -> FeedEntry:
+    """Convert a corpus post into a feedparser-style entry."""
+    published = post['created_at'].utctimetuple()
+    return FeedEntry(
+        title=post['title'],
+        summary=post['text'],
+        link=post['url'],
+        author=post['author'],
+        published=post['created_at'].strftime('%a, %d %b %Y %H:%M:%S +0000'),
+        published_parsed=published
+    )
+
+
+def render_rss(title: str, entries: List[FeedEntry]) -> bytes:
+    """Render entries as an RSS 2.0 document."""
+    items = []
+    for entry in entries:
+        items.append(
+            "<item>"
+            f"<title>{escape(entry['title'])}</title>"
+            f"<link>{escape(entry['link'])}</link>"
+            f"<description>{escape(entry['summary'])}</description>"
+            f"<dc:creator>{escape(entry['author'])}</dc:creator>"
+            f"<pubDate>{entry['published']}</pubDate>"
+            "</item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/"><channel>'
+        f"<title>{escape(title)}</title>{''.join(items)}</channel></rss>"
+    ).encode('utf-8')
+
+
+class FakeResponse(io.BytesIO):
+    """Stand-in for an HTTP response (file-like, with headers and geturl)."""
+
+    def __init__(self, url: str, body: bytes):
+        super().__init__(body)
+        self.url = url
+        self.headers = {'Content-Type': 'application/rss+xml; charset=utf-8'}
+
+    def geturl(self) -> str:
+        return self.url
+
+
+class FakeFeedparser:
+    """Stand-in for the feedparser module serving entries by URL."""
+
+    USER_AGENT = 'compliance-benchmarks'
+
+    def __init__(self):
+        self.feeds: Dict[str, List[FeedEntry]] = {}
+        self._documents: Dict[bytes, List[FeedEntry]] = {}
+
+    def load(self, posts: Iterable[Dict], feed_urls: Dict[str, str]) -> None:
+        """Register corpus RSS posts under their feed URLs, newest first."""
+        by_url: Dict[str, List[Dict]] = {}
+        for post in posts:
+            if post['source'] in feed_urls:
+                by_url.setdefault(feed_urls[post['source']], []).append(post)
+        for url, items in by_url.items():
+            items.sort(key=lambda p: p['created_at'], reverse=True)
+            self.feeds[url] = [build_entry(p) for p in items]
+
+    def open(self, url: str) -> 'FakeResponse':
+        """Stand-in for rss_collector.open_feed serving a rendered document."""
+        entries = self.feeds.get(url, [])
+        body = render_rss(url, entries)
+        self._documents[body] = entries
+        return FakeResponse(url, body)
+
+    def parse(self, url_or_body, **kwargs) -> FeedEntry:
+        """Return a parsed feed, like feedparser.parse()."""
+        if isinstance(url_or_body, bytes):
+            entries = self._documents.get(url_or_body, [])
+        else:
+            entries = self.feeds.get(url_or_body, [])
+        return FeedEntry(bozo=0, entries=entries, feed={})
+
+
+def install_stand_ins() -> FakeFeedparser:
+    """
+    Register stand-in `praw` and `feedparser` modules in sys.modules so the
+    collectors import offline. Returns the feedparser stand-in for loading feeds.
+    """
+    fake_feedparser = FakeFeedparser()
+
+    praw_module = types.ModuleType('praw')
+    praw_module.Reddit = FakeReddit
+    sys.modules['praw'] = praw_module
+
+    feedparser_module = types.ModuleType('feedparser')
+    feedparser_module.parse = fake_feedparser.parse
+    feedparser_module.USER_AGENT = fake_feedparser.USER_AGENT
+    # The streaming parser uses feedparser's sanitizer and date helpers; load
+    # those from the installed package, if any, as submodules of the stand-in
+    spec = importlib.machinery.PathFinder.find_spec('feedparser')
+    if spec is not None and spec.submodule_search_locations:
+        feedparser_module.__path__ = list(spec.submodule_search_locations)
+    sys.modules['feedparser'] = feedparser_module
+
+    return fake_feedparser
@@ -0,0 +1,105 @@
+"""
+Check that the streaming feed parser matches feedparser on fixture feeds.
+
+Usage:
+    python -m benchmarks.feed_parity
+
+Compares title/summary/link/author/published for every entry of every
+fixture in benchmarks/fixtures plus a rendered synthetic feed, and times
+both parsers. Fixtures are parsed as if served from BASE_URL, so relative
+links in summaries are resolved the same way by both. Exits with status 1 on any mismatch. Needs the real feedparser.
+"""
+import glob
+import os
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List
+
+import feedparser
+
+from src.feed_stream import iter_entries
+
+from .corpus import generate_posts
+from .fakes import build_entry, render_rss
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+FIELDS = ['title', 'summary', 'link', 'author', 'published']
+
+# URL the fixtures are treated as fetched from
+BASE_URL = 'https://example.org/feeds/fixture.xml'
+
+# Size of the synthetic feed used for timing
+SYNTHETIC_ENTRIES = 5000
+
+
+def feedparser_fields(body: bytes) -> List[Dict]:
+    """Entry fields as rss_collector reads them from feedparser."""
+    rows = []
+    for entry in feedparser.parse(body, response_headers={'content-location': BASE_URL}).entries:
+        published = None
+        if entry.get('published_parsed'):
+            published = datetime(*entry.published_parsed[:6])
+        elif entry.get('updated_parsed'):
+            published = datetime(*entry.updated_parsed[:6])
+        rows.append({
+            'title': entry.get('title', '').strip(),
+            'summary': entry.get('summary', '') or entry.get('description', ''),
+            'link': entry.get('link', ''),
+            'author': entry.get('author'),
+            'published': published
+        })
+    return rows
+
+
+def streaming_fields(body: bytes) -> List[Dict]:
+    """Entry fields from the streaming parser, fed in small chunks."""
+    chunks = (body[i:i + 4096] for i in range(0, len(body), 4096))
+    return [dict(entry, title=entry['title'].strip()) for entry in iter_entries(chunks, BASE_URL)]
+
+
+def compare(name: str, body: bytes) -> int:
+    """Print mismatches for one document; returns the mismatch count."""
+    start = time.perf_counter()
+    expected = feedparser_fields(body)
+    feedparser_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = streaming_fields(body)
+    streaming_seconds = time.perf_counter() - start
+
+    mismatches = 0
+    if len(expected) != len(actual):
+        print(f"  {name}: {len(actual)} entries, feedparser found {len(expected)}")
+        mismatches += 1
+
+    for i, (want, got) in enumerate(zip(expected, actual)):
+        for field in FIELDS:
+            if want[field] != got[field]:
+                print(f"  {name}[{i}].{field}: {got[field]!r} != feedparser {want[field]!r}")
+                mismatches += 1
+
+    status = 'OK' if not mismatches else f"{mismatches} mismatch(es)"
+    print(f"{name:<24} {len(actual):>6} entries  feedparser {feedparser_seconds:.3f}s  "
+          f"streaming {streaming_seconds:.3f}s  {status}")
+    return mismatches
+
+
+def main() -> int:
+    """Run the parity check over all fixtures."""
+    mismatches = 0
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, '*.xml'))):
+        with open(path, 'rb') as f:
+            mismatches += compare(os.path.basename(path), f.read())
+
+    posts = [p for p in generate_posts(SYNTHETIC_ENTRIES * 20) if p['source'] == 'TaxGuru']
+    posts.sort(key=lambda p: p['created_at'], reverse=True)
+    body = render_rss('Synthetic TaxGuru', [build_entry(p) for p in posts[:SYNTHETIC_ENTRIES]])
+    mismatches += compare('synthetic', body)
+
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
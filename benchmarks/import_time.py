@@ -0,0 +1,192 @@
+"""
+Import-time budget check for the cron collector and the dashboard.
+
+Usage:
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --output import_times.json
+
+Runs each entry point in a fresh interpreter under `python -X importtime`
+and sums the cumulative import time of everything it loads after a marker
+(so interpreter and Streamlit start-up are excluded where noted). Each
+target has a time budget and a list of heavy modules it must not load.
+Exits with status 1 if any target is over budget or loads a forbidden module.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from .run import bulk_load
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, 'app.py')
+
+# Written to stderr before the measured code; earlier imports are ignored
+MARKER = '--- importtime marker ---'
+
+# Runs per target; the fastest is reported (import time is noisy)
+REPEATS = 3
+
+# Posts in the database used for the dashboard render target
+APP_CORPUS_SIZE = 2000
+
+# Runs the dashboard script once; fails the target if the script raised
+APP_RUN = (
+    f"app = AppTest.from_file({APP_PATH!r}, default_timeout=60).run()\n"
+    "assert not app.exception, app.exception"
+)
+
+# Milliseconds of import time allowed per target, and modules that must not load
+TARGETS = [
+    {
+        'name': 'collect',
+        'setup': '',
+        'code': 'import collect',
+        'budget_ms': 150,
+        'forbidden': ['praw', 'feedparser', 'pandas', 'plotly']
+    },
+    {
+        'name': 'rss collector',
+        'setup': '',
+        'code': 'import src.rss_collector',
+        'budget_ms': 100,
+        'forbidden': ['praw', 'feedparser']
+    },
+    {
+        'name': 'reddit collector',
+        'setup': '',
+        'code': 'import src.reddit_collector',
+        'budget_ms': 100,
+        'forbidden': ['praw', 'feedparser', 'dotenv']
+    },
+    {
+        'name': 'app (no database)',
+        'setup': 'from streamlit.testing.v1 import AppTest',
+        'code': APP_RUN,
+        'budget_ms': 300,
+        'forbidden': ['pandas', 'plotly.express'],
+        'database': False
+    },
+    {
+        'name': 'app (render)',
+        'setup': 'from streamlit.testing.v1 import AppTest',
+        'code': APP_RUN,
+        'budget_ms': 2500,
+        'forbidden': [],
+        'database': True
+    }
+]
+
+
+def parse_importtime(stderr: str) -> Dict:
+    """
+    Parse `-X importtime` output after the marker.
+    Returns the total cumulative microseconds of top-level imports and the
+    modules loaded, heaviest first.
+    """
+    total_us = 0
+    modules = []
+    for line in stderr.split(MARKER, 1)[-1].splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        # Names are indented two spaces per nesting level after one separator space
+        depth = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        if depth == 0:
+            total_us += int(cumulative_us)
+        modules.append({
+            'module': name.strip(),
+            'self_us': int(self_us),
+            'cumulative_us': int(cumulative_us)
+        })
+    modules.sort(key=lambda m: m['cumulative_us'], reverse=True)
+    return {'total_us': total_us, 'modules': modules}
+
+
+def measure_target(target: Dict, workdir: str) -> Dict:
+    """Run one target in fresh interpreters and return its fastest measurement."""
+    script = (
+        f"{target['setup']}\n"
+        f"import sys; sys.stderr.write({MARKER!r} + '\\n'); sys.stderr.flush()\n"
+        f"{target['code']}\n"
+    )
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    best = None
+    for _ in range(REPEATS):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', script],
+            cwd=workdir, env=env, capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"{target['name']} failed:\n{result.stderr[-2000:]}")
+        parsed = parse_importtime(result.stderr)
+        if best is None or parsed['total_us'] < best['total_us']:
+            best = parsed
+    return best
+
+
+def check(target: Dict, measured: Dict) -> List[str]:
+    """Return budget and forbidden-module violations for a target."""
+    problems = []
+    total_ms = measured['total_us'] / 1000
+    if total_ms > target['budget_ms']:
+        problems.append(f"{total_ms:.0f}ms over the {target['budget_ms']}ms budget")
+    loaded = {m['module'] for m in measured['modules']}
+    for module in target['forbidden']:
+        if module in loaded:
+            problems.append(f"loads {module}")
+    return problems
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Measure every target and check it against its budget."""
+    parser = argparse.ArgumentParser(description="Check import-time budgets of entry points")
+    parser.add_argument('--output', help="Also write measurements as JSON to this path")
+    parser.add_argument('--top', type=int, default=5, help="Heaviest imports to list per target")
+    args = parser.parse_args(argv)
+
+    report = []
+    failures = 0
+    with tempfile.TemporaryDirectory(prefix='compliance_import_') as empty_dir, \
+            tempfile.TemporaryDirectory(prefix='compliance_import_db_') as data_dir:
+        from src.database import init_db
+        db_path = os.path.join(data_dir, 'compliance_data.db')
+        init_db(db_path)
+        # Recent posts, so the dashboard's default date range renders charts
+        bulk_load(db_path, APP_CORPUS_SIZE, seed=1, now=datetime.now())
+
+        for target in TARGETS:
+            workdir = data_dir if target.get('database') else empty_dir
+            measured = measure_target(target, workdir)
+            problems = check(target, measured)
+            failures += bool(problems)
+
+            status = 'OK' if not problems else 'FAIL: ' + '; '.join(problems)
+            print(f"{target['name']:<24} {measured['total_us'] / 1000:8.1f}ms "
+                  f"(budget {target['budget_ms']}ms)  {status}")
+            for module in measured['modules'][:args.top]:
+                print(f"    {module['cumulative_us'] / 1000:8.1f}ms  {module['module']}")
+
+            report.append({
+                'name': target['name'],
+                'total_ms': round(measured['total_us'] / 1000, 3),
+                'budget_ms': target['budget_ms'],
+                'problems': problems,
+                'top': measured['modules'][:args.top]
+            })
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
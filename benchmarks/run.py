@@ -0,0 +1,346 @@
+"""
+Benchmark runner for the collection and dashboard hot paths.
+
+Usage:
+    python -m benchmarks.run                       # 10k, 100k, 1M posts
+    python -m benchmarks.run --sizes 10000 --output results.json
+
+Runs fully offline against a temporary database. Results are written as
+JSON so runs from different commits can be compared with benchmarks.compare.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Callable, Dict, List, Optional
+
+from src.database import (
+    init_db, connect, insert_post, insert_posts, get_posts, get_stats, post_exists, backfill_spikes,
+    backfill_cooccurrence, check_dashboard_queries
+)
+from src.tagger import tag_content
+
+from .corpus import FEEDS, generate_posts
+
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+DEFAULT_SEED = 42
+CHUNK_SIZE = 10_000
+SAMPLE_SIZE = 1_000
+REPEATS = 3
+
+# Unfiltered get_posts materialises every row; cap it to keep memory bounded
+FULL_SCAN_LIMIT = 100_000
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+
+
+def git_commit() -> Optional[str]:
+    """Return the current git commit hash, if available."""
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def summarize(name: str, size: int, ops: int, timings: List[float]) -> Dict:
+    """Build a result record from repeated wall-clock timings (seconds)."""
+    best = min(timings)
+    return {
+        'name': name,
+        'size': size,
+        'ops': ops,
+        'timings': [round(t, 6) for t in timings],
+        'best': round(best, 6),
+        'median': round(statistics.median(timings), 6),
+        'per_op_us': round(best / ops * 1e6, 3) if ops else None
+    }
+
+
+def measure(func: Callable[[], int], repeats: int = REPEATS) -> tuple:
+    """Run func `repeats` times; func returns its op count."""
+    timings = []
+    ops = 0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        ops = func()
+        timings.append(time.perf_counter() - start)
+    return ops, timings
+
+
+def bulk_load(db_path: str, size: int, seed: int, now: Optional[datetime] = None) -> List[Dict]:
+    """
+    Load `size` synthetic posts through insert_posts in chunks, timing
+    tag_content along the way. As on a first collection run, near-duplicates
+    and tag pairs are counted as posts are stored and the spike state is
+    built afterwards by replaying them in date order.
+    Returns result records for tagging, bulk insertion and the replay.
+    """
+    backfill_cooccurrence(db_path)
+
+    tag_seconds = 0.0
+    load_seconds = 0.0
+    conn = connect(db_path)
+    chunk: List[Dict] = []
+
+    def flush():
+        nonlocal load_seconds
+        start = time.perf_counter()
+        insert_posts(chunk, conn=conn)
+        load_seconds += time.perf_counter() - start
+        chunk.clear()
+
+    for post in generate_posts(size, seed=seed, now=now):
+        start = time.perf_counter()
+        post['tags'] = tag_content(post['title'], post['text'])
+        tag_seconds += time.perf_counter() - start
+
+        chunk.append(post)
+        if len(chunk) >= CHUNK_SIZE:
+            flush()
+    if chunk:
+        flush()
+    conn.close()
+
+    start = time.perf_counter()
+    replayed = backfill_spikes(db_path)
+    replay_seconds = time.perf_counter() - start
+
+    return [
+        summarize('tag_content', size, size, [tag_seconds]),
+        summarize('bulk_load', size, size, [load_seconds]),
+        summarize('backfill_spikes', size, replayed, [replay_seconds])
+    ]
+
+
+def bench_insert_post(db_path: str, size: int, seed: int) -> Dict:
+    """Time insert_post (one connection + commit per post) on a loaded DB."""
+    sample = list(generate_posts(SAMPLE_SIZE, seed=seed + 1))
+    for post in sample:
+        post['post_id'] = f"bench_{post['post_id']}"
+        post['tags'] = tag_content(post['title'], post['text'])
+
+    start = time.perf_counter()
+    for post in sample:
+        insert_post(db_path=db_path, **post)
+    elapsed = time.perf_counter() - start
+    return summarize('insert_post', size, len(sample), [elapsed])
+
+
+def bench_post_exists(db_path: str, size: int, seed: int) -> Dict:
+    """Time post_exists for a mix of present and missing ids."""
+    # A prefix of the loaded corpus (the draws depend on its size)
+    present = [p['post_id'] for p in islice(generate_posts(size, seed=seed), SAMPLE_SIZE // 2)]
+    missing = [f"reddit_missing{i}" for i in range(SAMPLE_SIZE // 2)]
+    ids = present + missing
+
+    def run():
+        for post_id in ids:
+            post_exists(post_id, db_path=db_path)
+        return len(ids)
+
+    ops, timings = measure(run)
+    return summarize('post_exists', size, ops, timings)
+
+
+def bench_get_posts(db_path: str, size: int, now: datetime) -> List[Dict]:
+    """Time get_posts for the dashboard's default window and unfiltered."""
+    results = []
+    start_date = now - timedelta(days=14)
+
+    ops, timings = measure(lambda: len(get_posts(start_date=start_date, end_date=now, db_path=db_path)))
+    results.append(summarize('get_posts_14d', size, ops, timings))
+
+    ops, timings = measure(lambda: len(get_posts(source='SEBI', db_path=db_path)))
+    results.append(summarize('get_posts_source', size, ops, timings))
+
+    if size <= FULL_SCAN_LIMIT:
+        ops, timings = measure(lambda: len(get_posts(db_path=db_path)), repeats=1)
+        results.append(summarize('get_posts_all', size, ops, timings))
+    return results
+
+
+def bench_get_stats(db_path: str, size: int) -> Dict:
+    """Time get_stats."""
+    def run():
+        get_stats(db_path=db_path)
+        return 1
+
+    ops, timings = measure(run)
+    return summarize('get_stats', size, ops, timings)
+
+
+def bench_dataframe_prep(db_path: str, size: int, now: datetime) -> List[Dict]:
+    """Time the DataFrame preparation app.py runs on every load (needs pandas)."""
+    try:
+        import numpy as np
+        import pandas as pd
+        from src.tag_matrix import build_tag_matrix, tag_mask, tag_counts, tag_share
+    except ImportError:
+        print("  pandas not installed, skipping dataframe_prep")
+        return []
+
+    posts = get_posts(start_date=now - timedelta(days=14), end_date=now, db_path=db_path)
+    search_tags = ['GST', 'PortalIssues']
+    pain_tags = ['PortalIssues', 'Deadlines', 'Negative']
+
+    def build():
+        # Cached per loaded dataset in app.py
+        build_tag_matrix([post['tags'] for post in posts])
+        return len(posts)
+
+    matrix, vocab = build_tag_matrix([post['tags'] for post in posts])
+
+    def run():
+        # Mirrors the filter and KPI steps in app.py
+        df = pd.DataFrame(posts)
+        df['created_at'] = pd.to_datetime(df['created_at'], format='mixed', errors='coerce')
+        df['date'] = df['created_at'].dt.date
+        keep = np.ones(len(df), dtype=bool)
+        keep &= tag_mask(matrix, vocab, search_tags)
+        df = df[keep]
+        rows = df.drop_duplicates('canonical_id').index.to_numpy()
+        tag_share(matrix, vocab, pain_tags, rows)
+        df.groupby('date').size()
+        pd.Series(tag_counts(matrix, vocab, rows)).sort_values(ascending=False, kind='stable').head(10)
+        return len(posts)
+
+    ops, timings = measure(build)
+    results = [summarize('tag_matrix_build', size, ops, timings)]
+    ops, timings = measure(run)
+    results.append(summarize('dataframe_prep', size, ops, timings))
+    return results
+
+
+def bench_collectors(size: int, seed: int) -> List[Dict]:
+    """Run the Reddit and RSS collectors end to end against stand-in APIs."""
+    from .fakes import FakeReddit, install_stand_ins
+
+    fake_feedparser = install_stand_ins()
+    try:
+        from src.reddit_collector import collect_from_subreddit, refresh_scores
+        from src import rss_collector
+    except ImportError as e:
+        print(f"  Collector dependencies missing ({e}), skipping collectors")
+        return []
+    rss_collector.open_feed = fake_feedparser.open
+
+    batch = list(generate_posts(SAMPLE_SIZE, seed=seed + 2, days_back=30, now=datetime.now()))
+    reddit = FakeReddit(batch)
+    results = []
+
+    start = time.perf_counter()
+    processed = 0
+    for name in {p['subreddit'] for p in batch if p['subreddit']}:
+        processed += collect_from_subreddit(reddit, name, days_back=180, limit=1000)['total']
+    results.append(summarize('collect_reddit', size, processed, [time.perf_counter() - start]))
+
+    reddit.bump_scores()
+    start = time.perf_counter()
+    refreshed = refresh_scores(reddit, window_days=30, requests_per_minute=0)
+    results.append(summarize('refresh_scores', size, refreshed['candidates'], [time.perf_counter() - start]))
+
+    def collect_rss(name: str, stream: bool) -> None:
+        start = time.perf_counter()
+        processed = 0
+        for feed_name, feed_url in FEEDS.items():
+            processed += rss_collector.collect_from_feed(feed_name, feed_url, days_back=180, stream=stream)['total']
+        results.append(summarize(name, size, processed, [time.perf_counter() - start]))
+
+    # Each mode reads its own feed set, so both store every entry
+    fake_feedparser.load(generate_posts(SAMPLE_SIZE, seed=seed + 3, days_back=30, now=datetime.now()), FEEDS)
+    collect_rss('collect_rss', stream=False)
+    fake_feedparser.load(generate_posts(SAMPLE_SIZE, seed=seed + 4, days_back=30, now=datetime.now()), FEEDS)
+    collect_rss('collect_rss_stream', stream=True)
+    # Polling the same feeds again: streaming stops after a run of stored entries
+    collect_rss('collect_rss_stream_seen', stream=True)
+    return results
+
+
+def run_size(size: int, seed: int, workdir: str) -> List[Dict]:
+    """Run every benchmark against a fresh database of `size` posts."""
+    # Collectors write to the default DB_PATH, so run inside workdir
+    db_path = os.path.join(workdir, 'compliance_data.db')
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    init_db(db_path)
+    now = datetime(2025, 11, 9, 12, 0, 0)
+
+    print(f"\n[{size:,} posts] loading corpus...")
+    results = bulk_load(db_path, size, seed)
+
+    print(f"[{size:,} posts] running queries...")
+    results.append(bench_post_exists(db_path, size, seed))
+    results.extend(bench_get_posts(db_path, size, now))
+    results.append(bench_get_stats(db_path, size))
+
+    results.extend(bench_dataframe_prep(db_path, size, now))
+
+    print(f"[{size:,} posts] running writers...")
+    results.append(bench_insert_post(db_path, size, seed))
+    results.extend(bench_collectors(size, seed))
+
+    for result in results:
+        per_op = f"{result['per_op_us']:.1f} us/op" if result['per_op_us'] is not None else ''
+        print(f"  {result['name']:<24} best {result['best']:.4f}s  {per_op}")
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> Dict:
+    """Run the benchmark suite and write a JSON report."""
+    parser = argparse.ArgumentParser(description="Benchmark compliance tracker hot paths")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="Corpus sizes to benchmark")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help="Corpus seed")
+    parser.add_argument('--output', help="Path of the JSON report "
+                        "(default: benchmarks/results/<commit>.json)")
+    args = parser.parse_args(argv)
+
+    commit = git_commit()
+    report = {
+        'meta': {
+            'commit': commit,
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': args.seed,
+            'sizes': args.sizes
+        },
+        'results': [],
+        'index_checks': {}
+    }
+
+    original_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix='compliance_bench_') as workdir:
+        os.chdir(workdir)
+        try:
+            for size in args.sizes:
+                report['results'].extend(run_size(size, args.seed, workdir))
+                # Plans can change with table size and statistics
+                problems = check_dashboard_queries(os.path.join(workdir, 'compliance_data.db'))
+                report['index_checks'][str(size)] = problems
+                for problem in problems:
+                    print(f"  Not index-backed: {problem}")
+        finally:
+            os.chdir(original_cwd)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{(commit or 'local')[:12]}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+    return report
+
+
+if __name__ == '__main__':
+    main()
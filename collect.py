@@ -2,16 +2,127 @@
 Main collection orchestrator.
 Runs all data collectors and manages the database.
 """
+import argparse
 import sys
 from datetime import datetime
+from typing import List
 
-from src.database import init_db, get_stats
+from src.database import (
+    init_db, get_stats, backfill_signatures, backfill_spikes, backfill_cooccurrence, add_source, get_sources,
+    publish_snapshot, SNAPSHOT_PATH, enable_query_log
+)
+from src.query_log import SLOW_QUERY_MS, SLOW_QUERY_LOG_PATH
 from src.reddit_collector import collect_reddit_posts
 from src.rss_collector import collect_rss_feeds
+from src.run_report import start_report, current_report
+from src.daemon import run_daemon, RSS_POLL_INTERVAL
+from src.scheduler import run_scheduler, seed_sources, MAX_WORKERS, DEFAULT_MIN_INTERVAL, DEFAULT_MAX_INTERVAL
 
 
-def main():
-    """Run the complete data collection pipeline."""
+REPORT_PATH = "collection_report.json"
+PROFILE_PATH = "collection.prof"
+
+# Number of functions (by cumulative time) copied into the JSON report
+PROFILE_TOP_N = 25
+
+# Collectors selectable with --only
+SOURCES = ['reddit', 'rss']
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Collect compliance posts from Reddit and RSS feeds")
+    parser.add_argument('--report', default=REPORT_PATH,
+                        help=f"Path of the JSON run report (default: {REPORT_PATH})")
+    parser.add_argument('--only', choices=SOURCES,
+                        help="Collect from this source type only (skips loading the other collector)")
+    parser.add_argument('--refresh-scores', type=int, default=0, metavar='DAYS',
+                        help="One-shot Reddit collection: also refresh scores of posts from the last DAYS days")
+    parser.add_argument('--daemon', action='store_true',
+                        help="Keep running: stream new Reddit posts and poll RSS until SIGTERM/Ctrl+C")
+    parser.add_argument('--rss-interval', type=float, default=RSS_POLL_INTERVAL / 60, metavar='MINUTES',
+                        help="Daemon mode: minutes between RSS polls, 0 to disable "
+                             f"(default: {RSS_POLL_INTERVAL // 60})")
+    parser.add_argument('--schedule', action='store_true',
+                        help="Poll each source on its own adaptive interval until SIGTERM/Ctrl+C")
+    parser.add_argument('--once', action='store_true',
+                        help="With --schedule: poll the sources that are due now, then exit")
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS,
+                        help=f"With --schedule: sources polled concurrently (default: {MAX_WORKERS})")
+    parser.add_argument('--add-rss', nargs=2, metavar=('NAME', 'URL'),
+                        help="Register an RSS feed for scheduled polling and exit")
+    parser.add_argument('--add-subreddit', metavar='NAME',
+                        help="Register a subreddit for scheduled polling and exit")
+    parser.add_argument('--list-sources', action='store_true',
+                        help="Show scheduled sources with their poll rates and exit")
+    parser.add_argument('--backfill-spikes', action='store_true',
+                        help="Rebuild the spike detector state from all stored posts instead of collecting")
+    parser.add_argument('--no-snapshot', action='store_true',
+                        help=f"Don't publish the read-only dashboard snapshot ({SNAPSHOT_PATH})")
+    parser.add_argument('--query-log', nargs='?', const=SLOW_QUERY_LOG_PATH, metavar='PATH',
+                        help="Record query latency/rows/plans in the run report and log slow queries "
+                             f"to PATH (default: {SLOW_QUERY_LOG_PATH})")
+    parser.add_argument('--slow-query-ms', type=float, default=SLOW_QUERY_MS, metavar='MS',
+                        help=f"With --query-log: threshold for the slow-query log (default: {SLOW_QUERY_MS:g})")
+    parser.add_argument('--profile', action='store_true',
+                        help="Run under cProfile and dump stack traces on SIGUSR1")
+    parser.add_argument('--profile-output', default=PROFILE_PATH,
+                        help=f"Where to write cProfile stats (default: {PROFILE_PATH})")
+    args = parser.parse_args(argv)
+    if args.once and not args.schedule:
+        parser.error("--once requires --schedule")
+    if args.daemon and args.only == 'rss':
+        parser.error("--daemon streams Reddit; use --schedule --only rss for RSS-only polling")
+    if args.refresh_scores and (args.only == 'rss' or args.daemon or args.schedule or args.backfill_spikes):
+        parser.error("--refresh-scores runs with a one-shot Reddit collection (not --only rss, "
+                     "--daemon, --schedule or --backfill-spikes)")
+    return args
+
+
+def enable_stack_dumps() -> None:
+    """
+    Dump all thread stacks to stderr on SIGUSR1, so a slow run can be
+    sampled from outside (`kill -USR1 <pid>`) without stopping it.
+    """
+    import faulthandler
+    import signal
+
+    if hasattr(signal, 'SIGUSR1'):
+        faulthandler.register(signal.SIGUSR1, all_threads=True)
+
+
+def profile_summary(profiler, top_n: int = PROFILE_TOP_N) -> list:
+    """Return the top functions by cumulative time from a cProfile run."""
+    import pstats
+
+    stats = pstats.Stats(profiler)
+    rows = []
+    for (filename, line, func), (cc, nc, tottime, cumtime, _) in stats.stats.items():
+        rows.append({
+            'function': f"{filename}:{line}({func})",
+            'calls': nc,
+            'tottime': round(tottime, 6),
+            'cumtime': round(cumtime, 6)
+        })
+    rows.sort(key=lambda r: r['cumtime'], reverse=True)
+    return rows[:top_n]
+
+
+def print_report_summary(report: dict) -> None:
+    """Print per-stage timing totals from the run report."""
+    totals = report['totals']
+    print("Stage timings:")
+    for stage, seconds in sorted(totals['stages'].items(), key=lambda kv: kv[1], reverse=True):
+        print(f"  {stage:<10} {seconds:8.2f}s")
+    print(f"  API calls: {totals['api_calls']}, bytes downloaded: {totals['bytes_downloaded']}, "
+          f"DB round-trips: {totals['db_round_trips']}\n")
+
+
+def run_collection(refresh_window_days: int = 0, sources: List[str] = SOURCES) -> int:
+    """
+    Run the data collection pipeline for the given source types.
+    Returns new posts collected.
+    """
     print("\n" + "="*60)
     print("India Compliance Pain Tracker - Data Collection")
     print("="*60)
@@ -20,21 +131,36 @@ def main():
     # Initialize database
     print("Initializing database...")
     init_db()
+    backfilled = backfill_signatures()
+    if backfilled:
+        print(f"Indexed {backfilled} existing posts for near-duplicate detection.")
+    replayed = backfill_spikes()
+    if replayed:
+        print(f"Replayed {replayed} existing posts into the spike detector.")
+    if backfill_cooccurrence():
+        print("Counted tag co-occurrence of existing posts.")
     print("Database ready.\n")
 
+    reddit_stats = {'total_new': 0, 'total_skipped': 0, 'total_processed': 0}
+    rss_stats = {'total_new': 0, 'total_skipped': 0, 'total_processed': 0}
+
     # Collect from Reddit (6 months = 180 days, more posts per subreddit)
-    try:
-        reddit_stats = collect_reddit_posts(days_back=180, limit_per_sub=1000)
-    except Exception as e:
-        print(f"Reddit collection failed: {e}")
-        reddit_stats = {'total_new': 0, 'total_skipped': 0, 'total_processed': 0}
+    if 'reddit' in sources:
+        try:
+            reddit_stats = collect_reddit_posts(
+                days_back=180,
+                limit_per_sub=1000,
+                refresh_window_days=refresh_window_days
+            )
+        except Exception as e:
+            print(f"Reddit collection failed: {e}")
 
     # Collect from RSS feeds (6 months = 180 days)
-    try:
-        rss_stats = collect_rss_feeds(days_back=180)
-    except Exception as e:
-        print(f"RSS collection failed: {e}")
-        rss_stats = {'total_new': 0, 'total_skipped': 0, 'total_processed': 0}
+    if 'rss' in sources:
+        try:
+            rss_stats = collect_rss_feeds(days_back=180)
+        except Exception as e:
+            print(f"RSS collection failed: {e}")
 
     # Get overall database stats
     print("\nFetching database statistics...")
@@ -51,6 +177,7 @@ def main():
 
     print(f"\nDatabase totals:")
     print(f"  Total posts: {db_stats['total_posts']}")
+    print(f"  Unique stories (near-duplicates merged): {db_stats['unique_clusters']}")
     print(f"  Unique authors: {db_stats['unique_authors']}")
     print(f"  Sources tracked: {db_stats['sources']}")
     if db_stats['earliest_post'] and db_stats['latest_post']:
@@ -59,8 +186,112 @@ def main():
     print(f"\nCompleted at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("="*60 + "\n")
 
+    return reddit_stats['total_new'] + rss_stats['total_new']
+
+
+def manage_sources(args: argparse.Namespace) -> bool:
+    """Handle --add-rss/--add-subreddit/--list-sources. Returns True if one was given."""
+    if not (args.add_rss or args.add_subreddit or args.list_sources):
+        return False
+
+    init_db()
+    seed_sources()
+
+    if args.add_rss:
+        name, url = args.add_rss
+        added = add_source('rss', name, url, DEFAULT_MIN_INTERVAL, DEFAULT_MAX_INTERVAL)
+        print(f"{'Added' if added else 'Already registered'}: rss:{name}")
+    if args.add_subreddit:
+        added = add_source('reddit', args.add_subreddit, None, DEFAULT_MIN_INTERVAL, DEFAULT_MAX_INTERVAL)
+        print(f"{'Added' if added else 'Already registered'}: reddit:{args.add_subreddit}")
+
+    if args.list_sources:
+        print(f"{'Source':<32} {'Interval':>9} {'New/h':>7} {'Yield':>6} {'Polls':>6}  Next poll")
+        for source in get_sources():
+            interval = f"{source['interval'] // 60}m" if source['interval'] else '-'
+            rate = f"{source['rate']:.2f}" if source['rate'] is not None else '-'
+            yield_ratio = f"{source['yield_ratio']:.2f}" if source['yield_ratio'] is not None else '-'
+            next_poll = (source['next_poll_at'] or 'now')[:16]
+            print(f"{source['key']:<32} {interval:>9} {rate:>7} {yield_ratio:>6} {source['polls']:>6}  {next_poll}"
+                  + (f"  (error: {source['last_error']})" if source['last_error'] else ''))
+    return True
+
+
+def run(args: argparse.Namespace) -> int:
+    """
+    Run a one-shot collection, the scheduler or the daemon (or only the spike
+    backfill), then publish the dashboard snapshot. Returns new posts collected.
+    """
+    if args.backfill_spikes:
+        init_db()
+        # The collection modes build the tag pair counts when they start
+        with current_report().stage('cooccurrence', 'db_write'):
+            backfill_cooccurrence()
+        total_new = 0
+    elif args.schedule:
+        total_new = run_scheduler(once=args.once, max_workers=args.workers, kind=args.only,
+                                  snapshot=not args.no_snapshot)
+    elif args.daemon:
+        rss_interval = 0 if args.only == 'reddit' else args.rss_interval * 60
+        stats = run_daemon(rss_interval=rss_interval, snapshot=not args.no_snapshot)
+        total_new = stats['new'] + stats['rss_new']
+    else:
+        total_new = run_collection(args.refresh_scores, [args.only] if args.only else SOURCES)
+
+    # Replays posts into the spike state in date order after the first run,
+    # and after runs that stored posts too old to count as they arrived (a
+    # new source's history); otherwise they were counted as they were stored
+    with current_report().stage('spikes', 'db_write'):
+        replayed = backfill_spikes(rebuild=args.backfill_spikes)
+    if replayed:
+        print(f"Replayed {replayed} posts into the spike detector.")
+
+    if not args.no_snapshot:
+        with current_report().stage('snapshot', 'db_write'):
+            size = publish_snapshot()
+        print(f"Published dashboard snapshot {SNAPSHOT_PATH} ({size / 1e6:.1f} MB)")
+    return total_new
+
+
+def main(argv=None):
+    """Run the collection pipeline and write the JSON run report."""
+    args = parse_args(argv)
+    if manage_sources(args):
+        return
+
+    report = start_report()
+    query_log = enable_query_log(args.slow_query_ms, args.query_log) if args.query_log else None
+
+    if args.profile:
+        import cProfile
+
+        enable_stack_dumps()
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            total_new = run(args)
+        finally:
+            profiler.disable()
+            profiler.dump_stats(args.profile_output)
+            report.extra['profile'] = {
+                'output': args.profile_output,
+                'top': profile_summary(profiler)
+            }
+    else:
+        total_new = run(args)
+
+    if query_log:
+        report.extra['queries'] = query_log.summary()
+        for name in report.extra['queries']['full_scans']:
+            print(f"Full table scan: {name}")
+
+    report.finish()
+    report.write(args.report)
+    print_report_summary(report.to_dict())
+    print(f"Run report written to {args.report}")
+
     # Exit with appropriate code
-    if reddit_stats['total_new'] + rss_stats['total_new'] > 0:
+    if total_new > 0:
         print("Collection successful!")
         sys.exit(0)
     else:
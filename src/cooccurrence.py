@@ -0,0 +1,88 @@
+"""
+Precomputed tag co-occurrence counts per day and source.
+Each stored post adds one to every pair of its tags (and to each tag paired
+with itself), so co-occurrence over a date range is an indexed sum instead
+of a pass over every post's tags. A second count leaves out near-duplicates
+of posts stored before them (see dedup), for the dashboard's "count once" view.
+"""
+import sqlite3
+from datetime import datetime
+from itertools import combinations_with_replacement
+from typing import Iterable, List, Tuple, Union
+
+from .spikes import post_day
+
+
+# collector_state key recording when the counts were built (database.backfill_cooccurrence)
+BUILT_KEY = "cooccurrence:built_at"
+
+
+def create_tables(cursor: sqlite3.Cursor) -> None:
+    """Create the daily tag pair count table (tag_a <= tag_b)."""
+    columns = [row[1] for row in cursor.execute("PRAGMA table_info(tag_cooccurrence)")]
+    if columns and 'source' not in columns:
+        # Counts from before the per-source layout; the next backfill recounts them
+        cursor.execute("DROP TABLE tag_cooccurrence")
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS tag_cooccurrence (
+            day TEXT NOT NULL,
+            source TEXT NOT NULL,
+            tag_a TEXT NOT NULL,
+            tag_b TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            unique_count INTEGER NOT NULL,
+            PRIMARY KEY (day, source, tag_a, tag_b)
+        ) WITHOUT ROWID
+    """)
+
+
+def tag_pairs(tags: Iterable[str]) -> List[Tuple[str, str]]:
+    """Ordered pairs (tag_a <= tag_b) of a post's distinct tags, including (tag, tag)."""
+    return list(combinations_with_replacement(sorted(set(tags)), 2))
+
+
+def register_post(
+    cursor: sqlite3.Cursor,
+    source: str,
+    tags: Iterable[str],
+    created_at: Union[datetime, str],
+    unique: bool = True
+) -> int:
+    """
+    Count a newly stored post's tag pairs; `unique` is False for a
+    near-duplicate of a post stored before it. Only called once the counts have
+    been built by a backfill (database.insert_post checks BUILT_KEY), which
+    covers posts stored before then. Returns the number of pairs counted.
+    """
+    pairs = tag_pairs(tags)
+    if not pairs:
+        return 0
+
+    day = post_day(created_at).isoformat()
+    added = int(unique)
+    cursor.executemany("""
+        INSERT INTO tag_cooccurrence (day, source, tag_a, tag_b, count, unique_count) VALUES (?, ?, ?, ?, 1, ?)
+        ON CONFLICT (day, source, tag_a, tag_b) DO UPDATE
+        SET count = count + 1, unique_count = unique_count + excluded.unique_count
+    """, [(day, source, tag_a, tag_b, added) for tag_a, tag_b in pairs])
+    return len(pairs)
+
+
+def rebuild(cursor: sqlite3.Cursor) -> int:
+    """Recount every stored post's tag pairs in SQL. Returns the number of rows written."""
+    cursor.execute("DELETE FROM tag_cooccurrence")
+    cursor.execute("""
+        INSERT INTO tag_cooccurrence (day, source, tag_a, tag_b, count, unique_count)
+        SELECT day, source, tag_a, tag_b, COUNT(*), SUM(is_unique) FROM (
+            SELECT DISTINCT posts.id, date(posts.created_at) AS day, posts.source,
+                a.value AS tag_a, b.value AS tag_b,
+                s.canonical_id IS NULL OR s.canonical_id = posts.id AS is_unique
+            FROM posts
+            LEFT JOIN post_signatures s ON s.post_id = posts.id,
+            json_each(posts.tags) a, json_each(posts.tags) b
+            WHERE posts.tags IS NOT NULL AND a.value <= b.value
+        )
+        GROUP BY day, source, tag_a, tag_b
+    """)
+    return cursor.rowcount
@@ -0,0 +1,240 @@
+"""
+Long-running collector daemon.
+Streams new Reddit submissions and polls RSS feeds with one authenticated
+client and one DB connection, checkpointing progress across restarts.
+"""
+import signal
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Dict, Iterable, Optional
+
+from .database import (
+    DB_PATH, SNAPSHOT_INTERVAL, connect, init_db, backfill_signatures, backfill_spikes, backfill_cooccurrence,
+    get_state, set_state, publish_snapshot
+)
+from .reddit_collector import TARGET_SUBREDDITS, init_reddit, process_submission, track_http, untrack_http
+from .rss_collector import RSS_FEEDS, collect_from_feed
+from .run_report import current_report
+
+if TYPE_CHECKING:
+    import praw
+
+
+# Seconds between checkpoint writes while posts are arriving
+CHECKPOINT_INTERVAL = 30
+
+# Seconds between RSS polls (0 disables RSS in daemon mode)
+RSS_POLL_INTERVAL = 30 * 60
+
+# Seconds to wait after the stream reports no new submissions, doubling while
+# the stream stays idle up to MAX_IDLE_WAIT (PRAW's own backoff range).
+# With pause_after=0 PRAW doesn't sleep itself, so this paces idle requests.
+IDLE_WAIT = 1.0
+MAX_IDLE_WAIT = 16.0
+
+# Posts up to this many seconds older than a subreddit's checkpoint are still
+# processed: /new can list posts late (mod approval, spam filter release);
+# already stored ones are skipped by the dedup check
+CHECKPOINT_GRACE = 60 * 60
+
+# Backoff after API errors, doubling up to MAX_BACKOFF seconds
+MIN_BACKOFF = 5
+MAX_BACKOFF = 300
+
+# Posts older than this are ignored (matches the cron collection window)
+DAYS_BACK = 180
+
+# Checkpoint key per subreddit; value is the newest processed created_utc
+CHECKPOINT_KEY = "reddit_stream:{}"
+
+
+class CollectorDaemon:
+    """Streams submissions from target subreddits into the database until stopped."""
+
+    def __init__(
+        self,
+        reddit: 'praw.Reddit',
+        conn: sqlite3.Connection,
+        subreddits: Optional[Iterable[str]] = None,
+        feeds: Optional[Dict[str, str]] = None,
+        rss_interval: float = RSS_POLL_INTERVAL,
+        days_back: int = DAYS_BACK,
+        idle_wait: float = IDLE_WAIT,
+        snapshot_db_path: Optional[str] = None
+    ):
+        self.reddit = reddit
+        self.conn = conn
+        self.subreddits = list(subreddits or TARGET_SUBREDDITS)
+        self.feeds = dict(RSS_FEEDS if feeds is None else feeds)
+        self.rss_interval = rss_interval
+        self.days_back = days_back
+        self.idle_wait = idle_wait
+        # If set, a read-only snapshot of this database is republished as posts arrive
+        self.snapshot_db_path = snapshot_db_path
+        self._published_new = 0
+        self.stop_event = threading.Event()
+        self.stats = {'new': 0, 'skipped': 0, 'seen': 0, 'rss_new': 0, 'errors': 0}
+
+        self.checkpoints: Dict[str, float] = {}
+        for name in self.subreddits:
+            value = get_state(CHECKPOINT_KEY.format(name.lower()), conn=conn)
+            self.checkpoints[name.lower()] = float(value) if value else 0.0
+        self._dirty = False
+
+    def request_stop(self, signum=None, frame=None) -> None:
+        """Ask the run loop to exit after the current step."""
+        if not self.stop_event.is_set():
+            print("Shutdown requested, finishing current step...")
+        self.stop_event.set()
+
+    def install_signal_handlers(self) -> None:
+        """Stop gracefully on SIGTERM/SIGINT."""
+        signal.signal(signal.SIGTERM, self.request_stop)
+        signal.signal(signal.SIGINT, self.request_stop)
+
+    def _stream(self):
+        """Submission stream over all target subreddits (yields None when idle)."""
+        subreddit = self.reddit.subreddit('+'.join(self.subreddits))
+        # On (re)start PRAW replays the ~100 newest posts; checkpoints skip those already handled
+        return subreddit.stream.submissions(pause_after=0, skip_existing=False)
+
+    def handle(self, submission) -> None:
+        """Tag and store one streamed submission, advancing its subreddit checkpoint."""
+        name = getattr(submission.subreddit, 'display_name', str(submission.subreddit))
+        key = name.lower()
+
+        if submission.created_utc < self.checkpoints.get(key, 0.0) - CHECKPOINT_GRACE:
+            self.stats['seen'] += 1
+            return
+
+        cutoff_date = datetime.now() - timedelta(days=self.days_back)
+        inserted = process_submission(submission, name, cutoff_date, conn=self.conn)
+        if inserted:
+            self.stats['new'] += 1
+            print(f"  New r/{name} post: {submission.title[:80]}")
+        elif inserted is False:
+            self.stats['skipped'] += 1
+
+        self.checkpoints[key] = max(self.checkpoints.get(key, 0.0), submission.created_utc)
+        self._dirty = True
+
+    def checkpoint(self) -> None:
+        """Persist per-subreddit stream positions."""
+        if not self._dirty:
+            return
+        for key, created_utc in self.checkpoints.items():
+            set_state(CHECKPOINT_KEY.format(key), repr(created_utc), conn=self.conn)
+        self._dirty = False
+
+    def publish(self) -> None:
+        """Publish a dashboard snapshot if posts arrived since the last one."""
+        new = self.stats['new'] + self.stats['rss_new']
+        if not self.snapshot_db_path or new == self._published_new:
+            return
+        publish_snapshot(self.snapshot_db_path)
+        self._published_new = new
+
+    def poll_rss(self) -> None:
+        """Collect every RSS feed once (streaming, stops at already-stored entries)."""
+        for feed_name, feed_url in self.feeds.items():
+            stats = collect_from_feed(feed_name, feed_url, days_back=self.days_back, conn=self.conn)
+            self.stats['rss_new'] += stats['new']
+
+    def run(self) -> Dict[str, int]:
+        """
+        Process submissions until request_stop() is called.
+        While the stream is idle, requests are spaced idle_wait seconds apart,
+        doubling up to MAX_IDLE_WAIT; waits end early on shutdown. The first
+        time it goes idle, the spike state is replayed if needed (see
+        database.backfill_spikes).
+        Returns run statistics.
+        """
+        report = current_report()
+        hook = track_http(self.reddit, report, 'reddit:stream')
+        stream = self._stream()
+        backoff = MIN_BACKOFF
+        idle_wait = self.idle_wait
+        replay_spikes = True
+        last_checkpoint = time.monotonic()
+        last_snapshot = time.monotonic()
+        next_rss = time.monotonic()
+
+        try:
+            while not self.stop_event.is_set():
+                if self.feeds and self.rss_interval and time.monotonic() >= next_rss:
+                    self.poll_rss()
+                    next_rss = time.monotonic() + self.rss_interval
+
+                try:
+                    submission = next(stream)
+                except Exception as e:
+                    self.stats['errors'] += 1
+                    print(f"Stream error: {e}; retrying in {backoff}s")
+                    self.stop_event.wait(backoff)
+                    backoff = min(backoff * 2, MAX_BACKOFF)
+                    stream = self._stream()
+                    continue
+                backoff = MIN_BACKOFF
+
+                if submission is None:
+                    if replay_spikes:
+                        # The startup backlog (stored newest first) is in; count it in date order
+                        replayed = backfill_spikes(conn=self.conn)
+                        if replayed:
+                            print(f"Replayed {replayed} posts into the spike detector.")
+                        replay_spikes = False
+                    self.stop_event.wait(idle_wait)
+                    idle_wait = min(idle_wait * 2, MAX_IDLE_WAIT)
+                else:
+                    idle_wait = self.idle_wait
+                    self.handle(submission)
+
+                if time.monotonic() - last_checkpoint >= CHECKPOINT_INTERVAL:
+                    self.checkpoint()
+                    last_checkpoint = time.monotonic()
+
+                if time.monotonic() - last_snapshot >= SNAPSHOT_INTERVAL:
+                    self.publish()
+                    last_snapshot = time.monotonic()
+        finally:
+            self.checkpoint()
+            untrack_http(self.reddit, hook)
+
+        report.set_stats('reddit:stream', self.stats)
+        return self.stats
+
+
+def run_daemon(
+    rss_interval: float = RSS_POLL_INTERVAL,
+    snapshot: bool = True,
+    db_path: str = DB_PATH
+) -> Dict[str, int]:
+    """
+    Run the collector daemon until SIGTERM/SIGINT, republishing the dashboard
+    snapshot periodically if `snapshot`. Returns run statistics.
+    """
+    print("Initializing database...")
+    init_db(db_path)
+    backfill_signatures(db_path)
+    backfill_spikes(db_path)
+    backfill_cooccurrence(db_path)
+
+    print("Initializing Reddit API...")
+    with current_report().stage('reddit', 'init'):
+        reddit = init_reddit()
+
+    conn = connect(db_path)
+    daemon = CollectorDaemon(reddit, conn, rss_interval=rss_interval,
+                             snapshot_db_path=db_path if snapshot else None)
+    daemon.install_signal_handlers()
+
+    print(f"Streaming r/{'+'.join(daemon.subreddits)} (Ctrl+C to stop)...")
+    try:
+        stats = daemon.run()
+    finally:
+        conn.close()
+
+    print(f"Daemon stopped. New Reddit posts: {stats['new']}, new RSS entries: {stats['rss_new']}")
+    return stats
@@ -1,18 +1,149 @@
 """
 SQLite database setup and utilities for compliance tracking.
 """
+import os
 import sqlite3
-from datetime import datetime
-from typing import List, Dict, Optional
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Dict, Iterable, Optional, Sequence, Tuple
 import json
 
+from . import cooccurrence, dedup, spikes
+from .query_log import QueryLog, SLOW_QUERY_MS, SLOW_QUERY_LOG_PATH
+
 
 DB_PATH = "compliance_data.db"
 
+# Read-only copy of DB_PATH that collect.py publishes for the dashboard
+SNAPSHOT_PATH = "compliance_snapshot.db"
+
+# Bytes of a read-only database that readers memory-map
+READ_ONLY_MMAP_SIZE = 256 * 1024 * 1024
+
+# Minimum seconds between snapshots published by long-running collectors
+SNAPSHOT_INTERVAL = 5 * 60
+
+# If set, query instrumentation is enabled on import with this slow-query log path
+QUERY_LOG_ENV = "COMPLIANCE_QUERY_LOG"
+
+_query_log: Optional[QueryLog] = None
+
+
+def enable_query_log(slow_ms: float = SLOW_QUERY_MS, path: Optional[str] = SLOW_QUERY_LOG_PATH) -> QueryLog:
+    """
+    Start recording latency, rows and plans of the read queries below.
+    Queries slower than slow_ms are appended to `path` (None: don't log).
+    """
+    global _query_log
+    _query_log = QueryLog(slow_ms, path)
+    return _query_log
+
+
+def disable_query_log() -> Optional[QueryLog]:
+    """Stop recording queries; returns the log that was active."""
+    global _query_log
+    log, _query_log = _query_log, None
+    return log
+
+
+def current_query_log() -> Optional[QueryLog]:
+    """The active query log, if instrumentation is enabled."""
+    return _query_log
+
+
+if os.getenv(QUERY_LOG_ENV):
+    enable_query_log(path=os.environ[QUERY_LOG_ENV])
+
+
+def _fetch(cursor: sqlite3.Cursor, name: str, sql: str, params: Sequence = (), one: bool = False):
+    """Execute a read query and fetch all rows (or one), recording it if instrumented."""
+    log = _query_log
+    if log is None:
+        cursor.execute(sql, params)
+        return cursor.fetchone() if one else cursor.fetchall()
+
+    start = time.perf_counter()
+    cursor.execute(sql, params)
+    result = cursor.fetchone() if one else cursor.fetchall()
+    elapsed = time.perf_counter() - start
+
+    rows = (result is not None) if one else len(result)
+    log.record(cursor.connection, name, sql, params, elapsed, int(rows))
+    return result
+
+
+def _has_table(cursor: sqlite3.Cursor, name: str) -> bool:
+    """Whether the database has table `name` (read-only databases may predate it)."""
+    return cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+    ).fetchone() is not None
+
+
+class Connection(sqlite3.Connection):
+    """
+    sqlite3 connection with a per-connection cache of which derived tables
+    have been built (see is_built).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.built: Dict[str, bool] = {}
+
+
+def connect(db_path: str = DB_PATH) -> sqlite3.Connection:
+    """
+    Open a database connection. `file:` URIs (see read_only_uri) are opened
+    as URIs, and read-only ones are memory-mapped.
+    """
+    if not db_path.startswith('file:'):
+        return sqlite3.connect(db_path, factory=Connection)
+    conn = sqlite3.connect(db_path, uri=True, factory=Connection)
+    if 'mode=ro' in db_path:
+        conn.execute(f"PRAGMA mmap_size = {READ_ONLY_MMAP_SIZE}")
+    return conn
+
+
+def read_only_uri(path: str, immutable: bool = True) -> str:
+    """
+    URI opening `path` read-only. With immutable, SQLite skips locking and
+    change detection entirely, so only use it for files nobody writes to.
+    """
+    uri = f"{Path(path).resolve().as_uri()}?mode=ro"
+    return uri + "&immutable=1" if immutable else uri
+
+
+def publish_snapshot(db_path: str = DB_PATH, snapshot_path: str = SNAPSHOT_PATH) -> int:
+    """
+    Publish a consistent copy of the database for read-only use.
+    The copy is made with SQLite's online backup API into a temporary file
+    next to the snapshot and then renamed over it, so readers always see a
+    complete snapshot. Returns the snapshot size in bytes.
+    """
+    tmp_path = f"{snapshot_path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    source = sqlite3.connect(db_path)
+    target = sqlite3.connect(tmp_path)
+    try:
+        source.backup(target)
+        # Immutable readers never look for a journal or WAL
+        target.execute("PRAGMA journal_mode = DELETE")
+        target.commit()
+    finally:
+        target.close()
+        source.close()
+
+    with open(tmp_path, 'rb') as f:
+        os.fsync(f.fileno())
+    os.replace(tmp_path, snapshot_path)
+    return os.path.getsize(snapshot_path)
+
 
 def init_db(db_path: str = DB_PATH) -> None:
     """Initialize the SQLite database with required schema."""
-    conn = sqlite3.connect(db_path)
+    conn = connect(db_path)
     cursor = conn.cursor()
 
     cursor.execute("""
@@ -43,11 +174,48 @@ def init_db(db_path: str = DB_PATH) -> None:
         CREATE INDEX IF NOT EXISTS idx_tags ON posts(tags)
     """)
 
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS collector_state (
+            key TEXT PRIMARY KEY,
+            value TEXT,
+            updated_at DATETIME NOT NULL
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS sources (
+            key TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            name TEXT NOT NULL,
+            url TEXT,
+            enabled INTEGER NOT NULL DEFAULT 1,
+            min_interval INTEGER NOT NULL,
+            max_interval INTEGER NOT NULL,
+            interval INTEGER,
+            next_poll_at DATETIME,
+            last_polled_at DATETIME,
+            rate REAL,
+            yield_ratio REAL,
+            polls INTEGER NOT NULL DEFAULT 0,
+            last_new INTEGER,
+            last_error TEXT
+        )
+    """)
+
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_sources_next_poll ON sources(next_poll_at)
+    """)
+
+    dedup.create_tables(cursor)
+    spikes.create_tables(cursor)
+    cooccurrence.create_tables(cursor)
+
     conn.commit()
     conn.close()
 
 
-def insert_post(
+def _store_post(
+    cursor: sqlite3.Cursor,
     post_id: str,
     source: str,
     title: str,
@@ -58,15 +226,13 @@ def insert_post(
     created_at: datetime,
     tags: List[str],
     subreddit: Optional[str] = None,
-    db_path: str = DB_PATH
+    collected_at: Optional[datetime] = None
 ) -> bool:
     """
-    Insert a single post into the database.
-    Returns True if inserted, False if already exists.
+    INSERT one post and update the near-duplicate, spike and co-occurrence
+    tables for it, without committing. Returns False (writing nothing) if
+    the post is already stored.
     """
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-
     try:
         cursor.execute("""
             INSERT INTO posts
@@ -81,17 +247,89 @@ def insert_post(
             url,
             score,
             created_at,
-            datetime.now(),
+            collected_at or datetime.now(),
             json.dumps(tags),
             subreddit
         ))
-        conn.commit()
-        conn.close()
-        return True
     except sqlite3.IntegrityError:
-        conn.close()
         return False
 
+    canonical_id = dedup.register_post(cursor, post_id, title, text, url)
+    # Until a backfill has built them, the derived tables are left alone
+    if is_built(cursor, spikes.BUILT_KEY):
+        spikes.register_post(cursor, source, tags, created_at)
+    if is_built(cursor, cooccurrence.BUILT_KEY):
+        cooccurrence.register_post(cursor, source, tags, created_at, unique=canonical_id in (None, post_id))
+    return True
+
+
+def insert_post(
+    post_id: str,
+    source: str,
+    title: str,
+    text: str,
+    author: str,
+    url: str,
+    score: int,
+    created_at: datetime,
+    tags: List[str],
+    subreddit: Optional[str] = None,
+    db_path: str = DB_PATH,
+    conn: Optional[sqlite3.Connection] = None
+) -> bool:
+    """
+    Insert a single post into the database.
+    Uses `conn` if given (left open), otherwise opens a connection to db_path.
+    Returns True if inserted, False if already exists.
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = connect(db_path)
+    cursor = conn.cursor()
+
+    try:
+        if not _store_post(cursor, post_id, source, title, text, author, url, score, created_at, tags, subreddit):
+            # Already stored
+            conn.rollback()
+            return False
+        conn.commit()
+        return True
+    except Exception:
+        # A failing hook must not leave the post stored without its derived rows
+        conn.rollback()
+        raise
+    finally:
+        if own_conn:
+            conn.close()
+
+
+def insert_posts(
+    posts: Iterable[Dict],
+    db_path: str = DB_PATH,
+    conn: Optional[sqlite3.Connection] = None
+) -> int:
+    """
+    Insert many posts (dicts of insert_post's arguments) in one transaction,
+    updating the derived tables exactly as insert_post does. Posts already
+    stored are skipped. Returns the number inserted.
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = connect(db_path)
+    cursor = conn.cursor()
+    collected_at = datetime.now()
+
+    try:
+        inserted = sum(_store_post(cursor, collected_at=collected_at, **post) for post in posts)
+        conn.commit()
+        return inserted
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        if own_conn:
+            conn.close()
+
 
 def get_posts(
     start_date: Optional[datetime] = None,
@@ -101,30 +339,44 @@ def get_posts(
 ) -> List[Dict]:
     """
     Retrieve posts from the database with optional filters.
+    Each post carries a canonical_id linking near-duplicates to one cluster
+    (its own id where signatures haven't been built).
     """
-    conn = sqlite3.connect(db_path)
+    conn = connect(db_path)
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
 
-    query = "SELECT * FROM posts WHERE 1=1"
+    if _has_table(cursor, 'post_signatures'):
+        query = """
+            SELECT posts.*, COALESCE(s.canonical_id, posts.id) AS canonical_id
+            FROM posts
+            LEFT JOIN post_signatures s ON s.post_id = posts.id
+            WHERE 1=1
+        """
+    else:
+        # Read-only database from before near-duplicate detection
+        query = "SELECT posts.*, posts.id AS canonical_id FROM posts WHERE 1=1"
     params = []
+    filters = []
 
     if start_date:
-        query += " AND created_at >= ?"
+        query += " AND posts.created_at >= ?"
         params.append(start_date)
+        filters.append('start')
 
     if end_date:
-        query += " AND created_at <= ?"
+        query += " AND posts.created_at <= ?"
         params.append(end_date)
+        filters.append('end')
 
     if source:
-        query += " AND source = ?"
+        query += " AND posts.source = ?"
         params.append(source)
+        filters.append('source')
 
-    query += " ORDER BY created_at DESC"
+    query += " ORDER BY posts.created_at DESC"
 
-    cursor.execute(query, params)
-    rows = cursor.fetchall()
+    rows = _fetch(cursor, f"get_posts({','.join(filters) or 'all'})", query, params)
     conn.close()
 
     posts = []
@@ -138,20 +390,26 @@ def get_posts(
 
 def get_stats(db_path: str = DB_PATH) -> Dict:
     """Get basic statistics about the collected data."""
-    conn = sqlite3.connect(db_path)
+    conn = connect(db_path)
     cursor = conn.cursor()
 
-    cursor.execute("SELECT COUNT(*) FROM posts")
-    total_posts = cursor.fetchone()[0]
+    total_posts = _fetch(cursor, 'get_stats.total_posts', "SELECT COUNT(*) FROM posts", one=True)[0]
 
-    cursor.execute("SELECT COUNT(DISTINCT author) FROM posts")
-    unique_authors = cursor.fetchone()[0]
+    unique_authors = _fetch(
+        cursor, 'get_stats.unique_authors', "SELECT COUNT(DISTINCT author) FROM posts", one=True
+    )[0]
 
-    cursor.execute("SELECT COUNT(DISTINCT source) FROM posts")
-    sources = cursor.fetchone()[0]
+    sources = _fetch(cursor, 'get_stats.sources', "SELECT COUNT(DISTINCT source) FROM posts", one=True)[0]
 
-    cursor.execute("SELECT MIN(created_at), MAX(created_at) FROM posts")
-    date_range = cursor.fetchone()
+    date_range = _fetch(
+        cursor, 'get_stats.date_range', "SELECT MIN(created_at), MAX(created_at) FROM posts", one=True
+    )
+
+    unique_clusters = _fetch(cursor, 'get_stats.unique_clusters', """
+        SELECT COUNT(*) FROM posts
+        LEFT JOIN post_signatures s ON s.post_id = posts.id
+        WHERE s.canonical_id IS NULL OR s.canonical_id = posts.id
+    """, one=True)[0]
 
     conn.close()
 
@@ -159,18 +417,425 @@ def get_stats(db_path: str = DB_PATH) -> Dict:
         'total_posts': total_posts,
         'unique_authors': unique_authors,
         'sources': sources,
+        'unique_clusters': unique_clusters,
         'earliest_post': date_range[0],
         'latest_post': date_range[1]
     }
 
 
-def post_exists(post_id: str, db_path: str = DB_PATH) -> bool:
-    """Check if a post already exists in the database."""
-    conn = sqlite3.connect(db_path)
+def get_post_sources(db_path: str = DB_PATH) -> List[str]:
+    """Distinct post sources, sorted (answered from idx_source)."""
+    conn = connect(db_path)
     cursor = conn.cursor()
 
-    cursor.execute("SELECT 1 FROM posts WHERE id = ? LIMIT 1", (post_id,))
-    exists = cursor.fetchone() is not None
+    rows = _fetch(cursor, 'get_post_sources', "SELECT DISTINCT source FROM posts ORDER BY source")
 
     conn.close()
+    return [row[0] for row in rows]
+
+
+def post_exists(
+    post_id: str,
+    db_path: str = DB_PATH,
+    conn: Optional[sqlite3.Connection] = None
+) -> bool:
+    """Check if a post already exists in the database."""
+    own_conn = conn is None
+    if own_conn:
+        conn = connect(db_path)
+    cursor = conn.cursor()
+
+    exists = _fetch(cursor, 'post_exists', "SELECT 1 FROM posts WHERE id = ? LIMIT 1", (post_id,), one=True) is not None
+
+    if own_conn:
+        conn.close()
     return exists
+
+
+def get_state(key: str, db_path: str = DB_PATH, conn: Optional[sqlite3.Connection] = None) -> Optional[str]:
+    """Read a collector checkpoint value."""
+    own_conn = conn is None
+    if own_conn:
+        conn = connect(db_path)
+    cursor = conn.cursor()
+
+    cursor.execute("SELECT value FROM collector_state WHERE key = ?", (key,))
+    row = cursor.fetchone()
+
+    if own_conn:
+        conn.close()
+    return row[0] if row else None
+
+
+def set_state(key: str, value: str, db_path: str = DB_PATH, conn: Optional[sqlite3.Connection] = None) -> None:
+    """Write a collector checkpoint value."""
+    own_conn = conn is None
+    if own_conn:
+        conn = connect(db_path)
+    cursor = conn.cursor()
+
+    cursor.execute("""
+        INSERT INTO collector_state (key, value, updated_at) VALUES (?, ?, ?)
+        ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at
+    """, (key, value, datetime.now()))
+    conn.commit()
+
+    if own_conn:
+        conn.close()
+
+
+def mark_built(cursor: sqlite3.Cursor, key: str) -> None:
+    """
+    Record (under collector_state `key`) that a derived table has been built,
+    so posts stored from now on update it. Not committed.
+    """
+    now = datetime.now()
+    cursor.execute("""
+        INSERT INTO collector_state (key, value, updated_at) VALUES (?, ?, ?)
+        ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at
+    """, (key, now.isoformat(timespec='seconds'), now))
+    cache = getattr(cursor.connection, 'built', None)
+    if cache is not None:
+        cache[key] = True
+
+
+def is_built(cursor: sqlite3.Cursor, key: str) -> bool:
+    """
+    Whether mark_built(key) has been recorded. Cached per connection
+    (database.Connection); backfills on other connections run before
+    collectors open theirs.
+    """
+    cache = getattr(cursor.connection, 'built', None)
+    if cache is not None and key in cache:
+        return cache[key]
+    built = cursor.execute("SELECT 1 FROM collector_state WHERE key = ?", (key,)).fetchone() is not None
+    if cache is not None:
+        cache[key] = built
+    return built
+
+
+def add_source(
+    kind: str,
+    name: str,
+    url: Optional[str] = None,
+    min_interval: int = 600,
+    max_interval: int = 86400,
+    db_path: str = DB_PATH
+) -> bool:
+    """
+    Register a source ('reddit' subreddit or 'rss' feed) for scheduled polling.
+    Intervals are in seconds. Returns False if the source already exists.
+    """
+    conn = connect(db_path)
+    cursor = conn.cursor()
+
+    cursor.execute("""
+        INSERT OR IGNORE INTO sources (key, kind, name, url, min_interval, max_interval)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, (f"{kind}:{name}", kind, name, url, min_interval, max_interval))
+    added = cursor.rowcount > 0
+
+    conn.commit()
+    conn.close()
+    return added
+
+
+def get_sources(
+    due_before: Optional[datetime] = None,
+    kind: Optional[str] = None,
+    db_path: str = DB_PATH
+) -> List[Dict]:
+    """
+    Get enabled sources, soonest next poll first.
+    If due_before is given, only sources due by then (or never polled).
+    """
+    conn = connect(db_path)
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+
+    query = "SELECT * FROM sources WHERE enabled = 1"
+    params = []
+
+    if due_before:
+        query += " AND (next_poll_at IS NULL OR next_poll_at <= ?)"
+        params.append(due_before)
+
+    if kind:
+        query += " AND kind = ?"
+        params.append(kind)
+
+    query += " ORDER BY next_poll_at IS NOT NULL, next_poll_at"
+
+    sources = [dict(row) for row in _fetch(cursor, 'get_sources', query, params)]
+
+    conn.close()
+    return sources
+
+
+def update_source(key: str, fields: Dict, db_path: str = DB_PATH) -> None:
+    """Update scheduling fields of a source."""
+    if not fields:
+        return
+
+    conn = connect(db_path)
+    cursor = conn.cursor()
+
+    assignments = ", ".join(f"{column} = ?" for column in fields)
+    cursor.execute(
+        f"UPDATE sources SET {assignments} WHERE key = ?",
+        list(fields.values()) + [key]
+    )
+
+    conn.commit()
+    conn.close()
+
+
+def get_refresh_candidates(
+    since: datetime,
+    source: str = 'Reddit',
+    db_path: str = DB_PATH
+) -> List[Dict]:
+    """Get id and current score of posts from `source` created since `since`, newest first."""
+    conn = connect(db_path)
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+
+    rows = [dict(row) for row in _fetch(cursor, 'get_refresh_candidates', """
+        SELECT id, score FROM posts
+        WHERE source = ? AND created_at >= ?
+        ORDER BY created_at DESC
+    """, (source, since))]
+
+    conn.close()
+    return rows
+
+
+def update_scores(updates: List[Tuple[str, int]], db_path: str = DB_PATH) -> int:
+    """
+    Write (post_id, score) pairs back in one transaction.
+    Returns the number of rows updated.
+    """
+    if not updates:
+        return 0
+
+    conn = connect(db_path)
+    cursor = conn.cursor()
+
+    cursor.executemany(
+        "UPDATE posts SET score = ? WHERE id = ?",
+        [(score, post_id) for post_id, score in updates]
+    )
+    updated = cursor.rowcount
+    conn.commit()
+    conn.close()
+    return updated
+
+
+def backfill_signatures(db_path: str = DB_PATH, batch_size: int = 1000) -> int:
+    """
+    Index posts stored before near-duplicate detection existed, oldest first
+    so the earliest copy becomes canonical, batch_size rows at a time.
+    Returns the number indexed (posts with no text are marked, not counted).
+    """
+    conn = connect(db_path)
+    cursor = conn.cursor()
+
+    cursor.execute("""
+        SELECT posts.id, posts.title, posts.text, posts.url FROM posts
+        LEFT JOIN post_signatures s ON s.post_id = posts.id
+        WHERE s.post_id IS NULL
+        ORDER BY posts.created_at
+    """)
+
+    write_cursor = conn.cursor()
+    indexed = 0
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        for post_id, title, text, url in rows:
+            if dedup.register_post(write_cursor, post_id, title or '', text or '', url or '') is not None:
+                indexed += 1
+        conn.commit()
+
+    conn.close()
+    return indexed
+
+
+def backfill_spikes(
+    db_path: str = DB_PATH,
+    chunk_size: int = 5000,
+    rebuild: bool = False,
+    conn: Optional[sqlite3.Connection] = None
+) -> int:
+    """
+    Build the spike detector state by replaying stored posts oldest first,
+    chunk_size rows at a time. Skipped if the state exists and no post has
+    been counted as late since it was built, unless `rebuild`. Tracking only
+    starts once there were posts to replay: collectors store newest first,
+    so a first run's posts are counted by the replay after it, in date order.
+    Uses `conn` if given (left open). Returns the number of posts replayed.
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = connect(db_path)
+    cursor = conn.cursor()
+
+    try:
+        if not rebuild and is_built(cursor, spikes.BUILT_KEY) and not spikes.has_late(cursor):
+            return 0
+
+        states: Dict = {}
+        replayed = 0
+        cursor.execute("SELECT source, tags, created_at FROM posts ORDER BY created_at")
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            replayed += spikes.replay(rows, states)
+
+        cursor.execute("DELETE FROM spike_state")
+        spikes.save_states(cursor, states)
+        if replayed:
+            mark_built(cursor, spikes.BUILT_KEY)
+        conn.commit()
+        return replayed
+    finally:
+        if own_conn:
+            conn.close()
+
+
+def get_spikes(
+    window: int = 1,
+    z_threshold: float = spikes.Z_THRESHOLD,
+    min_count: int = spikes.MIN_SPIKE_COUNT,
+    now: Optional[datetime] = None,
+    db_path: str = DB_PATH
+) -> List[Dict]:
+    """
+    Active alerts: (tag, source) keys with unusually many posts in the last
+    `window` days (1-7), highest z-score first. Tag or source '*' means all.
+    """
+    today = (now or datetime.now()).date()
+    conn = connect(db_path)
+    cursor = conn.cursor()
+
+    # Keys without posts in the window cannot be spiking
+    since = today - timedelta(days=window - 1)
+    rows = _fetch(cursor, 'get_spikes', """
+        SELECT tag, source, day, recent, mean, var, days, late FROM spike_state
+        WHERE day >= ?
+    """, (since.isoformat(),))
+
+    conn.close()
+    states = {(row[0], row[1]): spikes.state_from_row(row) for row in rows}
+    return spikes.find_spikes(states, today, window, z_threshold, min_count)
+
+
+def backfill_cooccurrence(db_path: str = DB_PATH, rebuild: bool = False) -> int:
+    """
+    Count the tag pairs of all stored posts into tag_cooccurrence. Skipped
+    if the counts already exist unless `rebuild`. Returns rows written.
+    """
+    conn = connect(db_path)
+    cursor = conn.cursor()
+
+    if is_built(cursor, cooccurrence.BUILT_KEY) and not rebuild:
+        conn.close()
+        return 0
+
+    written = cooccurrence.rebuild(cursor)
+    mark_built(cursor, cooccurrence.BUILT_KEY)
+    conn.commit()
+    conn.close()
+    return written
+
+
+def get_tag_cooccurrence(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    tags: Optional[List[str]] = None,
+    source: Optional[str] = None,
+    unique: bool = False,
+    db_path: str = DB_PATH
+) -> Dict[Tuple[str, str], int]:
+    """
+    Posts having both tags, per tag pair (tag_a <= tag_b), between two dates
+    (inclusive, whole days). (tag, tag) is the number of posts with the tag.
+    `tags` limits the result to pairs of those tags and `source` to posts
+    from that source. With `unique`, near-duplicates of posts stored before
+    them are left out, so each cluster counts once (by its first-stored copy;
+    collectors store newest first, backfill_signatures oldest first).
+    """
+    conn = connect(db_path)
+    cursor = conn.cursor()
+
+    count = 'unique_count' if unique else 'count'
+    query = f"SELECT tag_a, tag_b, SUM({count}) FROM tag_cooccurrence WHERE 1=1"
+    params: List = []
+    filters = ['unique'] if unique else []
+
+    if start_date:
+        query += " AND day >= ?"
+        params.append(start_date.strftime('%Y-%m-%d'))
+        filters.append('start')
+
+    if end_date:
+        query += " AND day <= ?"
+        params.append(end_date.strftime('%Y-%m-%d'))
+        filters.append('end')
+
+    if source:
+        query += " AND source = ?"
+        params.append(source)
+        filters.append('source')
+
+    if tags:
+        marks = ', '.join('?' * len(tags))
+        query += f" AND tag_a IN ({marks}) AND tag_b IN ({marks})"
+        params.extend(tags)
+        params.extend(tags)
+        filters.append('tags')
+
+    query += " GROUP BY tag_a, tag_b"
+
+    rows = _fetch(cursor, f"get_tag_cooccurrence({','.join(filters) or 'all'})", query, params)
+    conn.close()
+    return {(tag_a, tag_b): count for tag_a, tag_b, count in rows}
+
+
+def check_dashboard_queries(db_path: str = DB_PATH) -> List[str]:
+    """
+    Run the queries behind the dashboard and the collectors' hot paths against
+    db_path and return a problem for each one whose plan scans a whole table
+    instead of using an index. Meant for tests/benchmarks and CI checks.
+    """
+    global _query_log
+    previous = _query_log
+    log = enable_query_log(slow_ms=float('inf'), path=None)
+    now = datetime.now()
+    try:
+        get_posts(start_date=now - timedelta(days=14), end_date=now, db_path=db_path)
+        get_posts(start_date=now - timedelta(days=14), end_date=now, source='Reddit', db_path=db_path)
+        get_posts(source='Reddit', db_path=db_path)
+        get_post_sources(db_path)
+        post_exists('missing', db_path)
+        get_refresh_candidates(now - timedelta(days=7), db_path=db_path)
+        get_spikes(window=1, now=now, db_path=db_path)
+        get_tag_cooccurrence(now - timedelta(days=14), now, db_path=db_path)
+        get_tag_cooccurrence(now - timedelta(days=14), now, source='Reddit', unique=True, db_path=db_path)
+    finally:
+        _query_log = previous
+
+    return [
+        f"{name}: full table scan of {', '.join(stats['full_scan'])}"
+        for name, stats in log.summary()['queries'].items()
+        if stats['full_scan']
+    ]
+
+
+def assert_dashboard_queries_indexed(db_path: str = DB_PATH) -> None:
+    """Raise AssertionError if any check_dashboard_queries() query is not index-backed."""
+    problems = check_dashboard_queries(db_path)
+    if problems:
+        raise AssertionError("Queries not backed by an index:\n  " + "\n  ".join(problems))
@@ -0,0 +1,225 @@
+"""
+Near-duplicate detection using SimHash signatures and LSH band buckets.
+Links reposted circulars/press releases across sources to one canonical post.
+"""
+import hashlib
+import re
+import sqlite3
+from typing import FrozenSet, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+# 64-bit SimHash split into 4 bands of 16 bits. Two signatures within
+# MAX_DISTANCE bits of each other must agree on at least one band
+# (pigeonhole), so band buckets find every candidate without a full scan.
+SIGNATURE_BITS = 64
+BANDS = 4
+BAND_BITS = SIGNATURE_BITS // BANDS
+BAND_MASK = (1 << BAND_BITS) - 1
+MAX_DISTANCE = 3
+
+# Title words count more than body words
+TITLE_WEIGHT = 2
+TEXT_WEIGHT = 1
+
+# Only the start of long bodies is used; reposts differ mostly in trailing boilerplate
+MAX_TEXT_CHARS = 2000
+
+TAG_RE = re.compile(r'<[^>]+>')
+URL_RE = re.compile(r'https?://\S+')
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+# simhash stored for posts with no usable tokens; they get no LSH buckets, so
+# they are never matched, but backfills don't pick them up again
+NO_SIGNATURE = 0
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with HTML tags and URLs stripped."""
+    text = URL_RE.sub(' ', TAG_RE.sub(' ', text or ''))
+    return TOKEN_RE.findall(text.lower())
+
+
+def doc_numbers(title: str, url: str = '') -> FrozenSet[str]:
+    """
+    All-digit tokens of a post's title and link path (notification/circular
+    numbers, years), leading zeros dropped: "No. 02/2025" and ".../no-2-2025.pdf" agree.
+    """
+    text = f"{title or ''} {urlsplit(url or '').path}".lower()
+    return frozenset(str(int(token)) for token in TOKEN_RE.findall(text) if token.isdigit())
+
+
+def numbers_match(a: FrozenSet[str], b: FrozenSet[str]) -> bool:
+    """
+    Whether two posts can be copies of one notice: one's numbers must include
+    the other's. Near-identical notices that differ only in their number
+    (No. 02/2025 vs No. 03/2025) are kept apart; reposts that drop or add
+    numbers (a date, no number at all) still match.
+    """
+    return a <= b or b <= a
+
+
+# SimHash bit counts are accumulated in one big integer with a LANE_BITS-wide
+# counter per signature bit; _SPREAD maps a byte to its 8 bits spread into lanes
+LANE_BITS = 32
+LANE_MASK = (1 << LANE_BITS) - 1
+_SPREAD = [
+    sum(((byte >> i) & 1) << (LANE_BITS * i) for i in range(8))
+    for byte in range(256)
+]
+_BYTE_SHIFTS = [8 * LANE_BITS * k for k in range(SIGNATURE_BITS // 8)]
+
+
+def _spread_hash(feature: str) -> int:
+    """64-bit hash of a feature with each bit spread into its own lane."""
+    digest = hashlib.blake2b(feature.encode(), digest_size=8).digest()
+    return sum(_SPREAD[byte] << shift for byte, shift in zip(digest, _BYTE_SHIFTS))
+
+
+def simhash(title: str, text: str) -> Optional[int]:
+    """
+    Compute a 64-bit SimHash over word unigrams and bigrams.
+    Returns None if the post has no usable tokens.
+    """
+    weights = {}
+    for tokens, weight in (
+        (tokenize(title), TITLE_WEIGHT),
+        (tokenize((text or '')[:MAX_TEXT_CHARS]), TEXT_WEIGHT)
+    ):
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        for feature in features:
+            weights[feature] = weights.get(feature, 0) + weight
+
+    if not weights:
+        return None
+
+    # lanes[bit] = total weight of features with that bit set; the SimHash
+    # bit is 1 when that outweighs the features with the bit clear
+    lanes = 0
+    for feature, weight in weights.items():
+        lanes += _spread_hash(feature) * weight
+    total = sum(weights.values())
+
+    signature = 0
+    for bit in range(SIGNATURE_BITS):
+        if 2 * (lanes >> (LANE_BITS * bit) & LANE_MASK) > total:
+            signature |= 1 << bit
+    return signature
+
+
+def hamming(a: int, b: int) -> int:
+    """Number of differing bits between two signatures."""
+    return bin(a ^ b).count('1')
+
+
+def band_keys(signature: int) -> List[Tuple[int, int]]:
+    """(band, bucket) pairs for a signature."""
+    return [(band, signature >> (band * BAND_BITS) & BAND_MASK) for band in range(BANDS)]
+
+
+def to_sqlite(signature: int) -> int:
+    """Map an unsigned 64-bit signature onto SQLite's signed INTEGER."""
+    return signature - (1 << 64) if signature >= 1 << 63 else signature
+
+
+def from_sqlite(value: int) -> int:
+    """Inverse of to_sqlite."""
+    return value + (1 << 64) if value < 0 else value
+
+
+def create_tables(cursor: sqlite3.Cursor) -> None:
+    """Create the signature and LSH bucket tables."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS post_signatures (
+            post_id TEXT PRIMARY KEY,
+            simhash INTEGER NOT NULL,
+            canonical_id TEXT NOT NULL
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS lsh_buckets (
+            band INTEGER NOT NULL,
+            bucket INTEGER NOT NULL,
+            post_id TEXT NOT NULL
+        )
+    """)
+
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_lsh_bucket ON lsh_buckets(band, bucket)
+    """)
+
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_canonical_id ON post_signatures(canonical_id)
+    """)
+
+
+def find_duplicate(
+    cursor: sqlite3.Cursor,
+    signature: int,
+    max_distance: int = MAX_DISTANCE,
+    numbers: Optional[FrozenSet[str]] = None
+) -> Optional[str]:
+    """
+    Look up the canonical id of the closest indexed post within max_distance
+    bits, checking only posts that share an LSH bucket. If `numbers` is given,
+    candidates whose doc_numbers don't match them are skipped.
+    """
+    keys = band_keys(signature)
+    where = " OR ".join(["(b.band = ? AND b.bucket = ?)"] * len(keys))
+    params = [value for key in keys for value in key]
+
+    cursor.execute(f"""
+        SELECT DISTINCT s.simhash, s.canonical_id, posts.title, posts.url
+        FROM lsh_buckets b
+        JOIN post_signatures s ON s.post_id = b.post_id
+        JOIN posts ON posts.id = b.post_id
+        WHERE {where}
+    """, params)
+
+    best = None
+    best_distance = max_distance + 1
+    for stored, canonical_id, title, url in cursor.fetchall():
+        distance = hamming(signature, from_sqlite(stored))
+        if distance >= best_distance:
+            continue
+        if numbers is not None and not numbers_match(numbers, doc_numbers(title, url)):
+            continue
+        best, best_distance = canonical_id, distance
+    return best
+
+
+def register_post(
+    cursor: sqlite3.Cursor,
+    post_id: str,
+    title: str,
+    text: str,
+    url: str = '',
+    max_distance: int = MAX_DISTANCE
+) -> Optional[str]:
+    """
+    Index a newly inserted post and link it to its canonical post (the
+    first-stored copy of its cluster); copies must share its SimHash neighbourhood and its doc_numbers.
+    Returns the canonical id (the post's own id if it is not a duplicate),
+    or None if the post has no text to sign (it is recorded as NO_SIGNATURE).
+    """
+    signature = simhash(title, text)
+    if signature is None:
+        cursor.execute(
+            "INSERT INTO post_signatures (post_id, simhash, canonical_id) VALUES (?, ?, ?)",
+            (post_id, NO_SIGNATURE, post_id)
+        )
+        return None
+
+    numbers = doc_numbers(title, url)
+    canonical_id = find_duplicate(cursor, signature, max_distance, numbers) or post_id
+
+    cursor.execute(
+        "INSERT INTO post_signatures (post_id, simhash, canonical_id) VALUES (?, ?, ?)",
+        (post_id, to_sqlite(signature), canonical_id)
+    )
+    cursor.executemany(
+        "INSERT INTO lsh_buckets (band, bucket, post_id) VALUES (?, ?, ?)",
+        [(band, bucket, post_id) for band, bucket in band_keys(signature)]
+    )
+    return canonical_id
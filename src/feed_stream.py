@@ -0,0 +1,211 @@
+"""
+Incremental RSS/Atom parsing for large feeds.
+Yields entries one by one as bytes arrive, so callers can stop reading early.
+"""
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterable, Iterator, Optional
+from xml.sax.saxutils import escape, quoteattr
+
+
+# Bytes read from the network per parser feed
+CHUNK_SIZE = 64 * 1024
+
+ENTRY_TAGS = {'item', 'entry'}
+SUMMARY_TAGS = ['description', 'summary', 'encoded', 'content']
+DATE_TAGS = ['pubDate', 'published', 'updated', 'date', 'issued', 'modified']
+AUTHOR_TAGS = ['author', 'creator']
+
+ATOM_NS = '{http://www.w3.org/2005/Atom}'
+XHTML_NS = '{http://www.w3.org/1999/xhtml}'
+
+# Elements serialized as <tag /> in XHTML content
+VOID_TAGS = {'br', 'hr', 'img', 'input', 'meta', 'link', 'area', 'base', 'col', 'param', 'source', 'wbr'}
+
+
+def _local(tag: str) -> str:
+    """Strip the XML namespace from a tag."""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _text(elem: ET.Element) -> str:
+    """Text content of an element, including any nested markup text."""
+    return ''.join(elem.itertext()).strip()
+
+
+def _markup(elem: ET.Element) -> str:
+    """Serialize an element's content (text and child elements) as markup, dropping namespaces."""
+    parts = [escape(elem.text or '')]
+    for child in elem:
+        tag = _local(child.tag)
+        attrs = ''.join(f' {_local(name)}={quoteattr(value)}' for name, value in child.attrib.items())
+        inner = _markup(child)
+        if inner or tag not in VOID_TAGS:
+            parts.append(f'<{tag}{attrs}>{inner}</{tag}>')
+        else:
+            parts.append(f'<{tag}{attrs} />')
+        parts.append(escape(child.tail or ''))
+    return ''.join(parts)
+
+
+def _content(elem: ET.Element, base_url: str) -> str:
+    """
+    Summary/content value as feedparser returns it: plain text as is, HTML
+    and XHTML with relative links resolved against base_url and unsafe
+    markup (scripts, event handlers, ...) removed by feedparser's sanitizer.
+    """
+    if elem.tag.startswith(ATOM_NS):
+        content_type = elem.get('type', 'text')
+    else:
+        # RSS <description> and <content:encoded> hold (escaped) HTML
+        content_type = 'html'
+
+    if content_type in ('xhtml', 'application/xhtml+xml'):
+        mime_type = 'application/xhtml+xml'
+        # Atom wraps XHTML content in a <div> that isn't part of the value
+        children = list(elem)
+        if len(children) == 1 and children[0].tag == f'{XHTML_NS}div' and not (elem.text or '').strip():
+            elem = children[0]
+        value = _markup(elem).strip()
+    elif content_type in ('html', 'text/html'):
+        mime_type = 'text/html'
+        # Unescaped inline markup shows up as child elements
+        value = (_markup(elem) if len(elem) else elem.text or '').strip()
+    else:
+        return _text(elem)
+
+    if not value:
+        return ''
+    # Imported here so that importing the collectors doesn't load feedparser
+    from feedparser.sanitizer import _sanitize_html
+    from feedparser.urls import resolve_relative_uris
+
+    if base_url:
+        value = resolve_relative_uris(value, base_url, 'utf-8', mime_type)
+    return _sanitize_html(value, 'utf-8', mime_type)
+
+
+def parse_date(value: str) -> Optional[datetime]:
+    """
+    Parse an RFC 822 (RSS) or ISO 8601 (Atom) date into naive UTC,
+    matching feedparser's *_parsed fields. Other formats go through
+    feedparser's lenient date parsing.
+    """
+    value = (value or '').strip()
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            from feedparser.datetimes import _parse_date
+
+            parsed_struct = _parse_date(value)
+            return datetime(*parsed_struct[:6]) if parsed_struct else None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed.replace(microsecond=0)
+
+
+def _link(children: Dict[str, list]) -> str:
+    """Entry link: RSS <link> text or the Atom alternate link href."""
+    for elem in children.get('link', []):
+        href = elem.get('href')
+        if href is None:
+            if elem.text and elem.text.strip():
+                return elem.text.strip()
+        elif elem.get('rel', 'alternate') == 'alternate':
+            return href
+    return ''
+
+
+def _author(children: Dict[str, list]) -> Optional[str]:
+    """Entry author: RSS <author>/<dc:creator> text or Atom <author><name>."""
+    for tag in AUTHOR_TAGS:
+        for elem in children.get(tag, []):
+            name = next((c for c in elem if _local(c.tag) == 'name'), None)
+            value = _text(name if name is not None else elem)
+            if value:
+                return value
+    return None
+
+
+def entry_fields(elem: ET.Element, base_url: str = '') -> Dict:
+    """
+    Extract title/summary/link/author/published from an <item> or <entry>.
+    Relative links in the summary are resolved against base_url.
+    """
+    children: Dict[str, list] = {}
+    for child in elem:
+        children.setdefault(_local(child.tag), []).append(child)
+
+    def first_text(tags) -> str:
+        for tag in tags:
+            for child in children.get(tag, []):
+                value = _text(child)
+                if value:
+                    return value
+        return ''
+
+    summary = ''
+    for tag in SUMMARY_TAGS:
+        for child in children.get(tag, []):
+            summary = _content(child, base_url)
+            if summary:
+                break
+        if summary:
+            break
+
+    published = None
+    for tag in DATE_TAGS:
+        for child in children.get(tag, []):
+            published = parse_date(child.text)
+            if published:
+                break
+        if published:
+            break
+
+    return {
+        'title': first_text(['title']),
+        'summary': summary,
+        'link': _link(children),
+        'author': _author(children),
+        'published': published
+    }
+
+
+def iter_entries(chunks: Iterable[bytes], base_url: str = '') -> Iterator[Dict]:
+    """
+    Incrementally parse a feed document and yield entry fields in document
+    order (relative summary links resolved against base_url, the feed URL). Parsed entries are dropped from the tree, so memory stays bounded
+    by the largest entry rather than the whole feed. Raises ET.ParseError on
+    malformed XML.
+    """
+    parser = ET.XMLPullParser(events=('start', 'end'))
+    stack = []
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        for event, elem in parser.read_events():
+            if event == 'start':
+                stack.append(elem)
+                continue
+            stack.pop()
+            if _local(elem.tag) in ENTRY_TAGS:
+                yield entry_fields(elem, base_url)
+                if stack:
+                    stack[-1].remove(elem)
+
+    parser.close()
+
+
+def read_chunks(response, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield a file-like response's body in chunks."""
+    while True:
+        chunk = response.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
@@ -0,0 +1,132 @@
+"""
+Opt-in query instrumentation for database.py.
+Records per-query latency, rows returned and the EXPLAIN QUERY PLAN summary,
+appends slow queries to a JSON-lines log and flags full table scans.
+"""
+import json
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+
+# Queries slower than this (milliseconds) go to the slow-query log
+SLOW_QUERY_MS = 100.0
+
+# Default slow-query log (JSON lines)
+SLOW_QUERY_LOG_PATH = "slow_queries.log"
+
+# "SCAN posts" reads every row; so does "SCAN posts USING INDEX ..." (in index
+# order). Scans of a covering index only read the narrower index.
+_SCAN = re.compile(r'^SCAN (?:TABLE )?(\w+)(.*)$')
+_INDEX = re.compile(r'USING (?:COVERING )?INDEX (\w+)')
+
+
+def explain(conn: sqlite3.Connection, sql: str, params: Sequence = ()) -> List[str]:
+    """EXPLAIN QUERY PLAN detail lines for a query."""
+    return [row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()]
+
+
+def full_scans(plan: List[str]) -> List[str]:
+    """Tables the plan reads row by row in full (directly or through a non-covering index)."""
+    tables = []
+    for detail in plan:
+        match = _SCAN.match(detail.strip())
+        if match and 'COVERING INDEX' not in match.group(2):
+            tables.append(match.group(1))
+    return tables
+
+
+def indexes_used(plan: List[str]) -> List[str]:
+    """Indexes the plan searches or scans."""
+    return [match.group(1) for detail in plan for match in _INDEX.finditer(detail)]
+
+
+class QueryLog:
+    """Aggregates query measurements and writes the slow-query log."""
+
+    def __init__(self, slow_ms: float = SLOW_QUERY_MS, path: Optional[str] = SLOW_QUERY_LOG_PATH):
+        self.slow_ms = slow_ms
+        self.path = path
+        self.queries: Dict[str, Dict] = {}
+        # Plans are looked up once per distinct SQL text
+        self._plans: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+
+    def plan(self, conn: sqlite3.Connection, sql: str, params: Sequence) -> List[str]:
+        """Cached query plan for `sql`."""
+        if sql not in self._plans:
+            self._plans[sql] = explain(conn, sql, params)
+        return self._plans[sql]
+
+    def record(
+        self,
+        conn: sqlite3.Connection,
+        name: str,
+        sql: str,
+        params: Sequence,
+        seconds: float,
+        rows: int
+    ) -> None:
+        """Record one execution of a named query."""
+        plan = self.plan(conn, sql, params)
+        scans = full_scans(plan)
+        ms = seconds * 1000
+
+        with self._lock:
+            stats = self.queries.get(name)
+            if stats is None:
+                stats = self.queries[name] = {
+                    'calls': 0,
+                    'total_ms': 0.0,
+                    'max_ms': 0.0,
+                    'rows': 0,
+                    'slow': 0,
+                    'plan': plan,
+                    'indexes': indexes_used(plan),
+                    'full_scan': scans
+                }
+                if scans:
+                    print(f"  Query {name} does a full table scan of {', '.join(scans)}")
+            stats['calls'] += 1
+            stats['total_ms'] += ms
+            stats['max_ms'] = max(stats['max_ms'], ms)
+            stats['rows'] += rows
+
+            if ms >= self.slow_ms:
+                stats['slow'] += 1
+                self._write_slow({
+                    'at': datetime.now().isoformat(timespec='seconds'),
+                    'query': name,
+                    'ms': round(ms, 3),
+                    'rows': rows,
+                    'full_scan': scans,
+                    'plan': plan,
+                    'sql': ' '.join(sql.split())
+                })
+
+    def _write_slow(self, entry: Dict) -> None:
+        """Append a slow-query entry; caller holds the lock."""
+        if self.path:
+            with open(self.path, 'a') as f:
+                f.write(json.dumps(entry) + '\n')
+
+    def summary(self) -> Dict:
+        """Per-query statistics plus how often each index was used."""
+        with self._lock:
+            queries = {
+                name: dict(stats, total_ms=round(stats['total_ms'], 3), max_ms=round(stats['max_ms'], 3),
+                           avg_ms=round(stats['total_ms'] / stats['calls'], 3))
+                for name, stats in self.queries.items()
+            }
+        index_calls: Dict[str, int] = {}
+        for stats in queries.values():
+            for index in stats['indexes']:
+                index_calls[index] = index_calls.get(index, 0) + stats['calls']
+        return {
+            'slow_ms': self.slow_ms,
+            'queries': queries,
+            'index_calls': index_calls,
+            'full_scans': sorted(name for name, stats in queries.items() if stats['full_scan'])
+        }
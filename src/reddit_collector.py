@@ -3,13 +3,17 @@ Reddit data collector using PRAW.
 Collects posts from specified subreddits based on compliance keywords.
 """
 import os
+import time
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
-import praw
-from dotenv import load_dotenv
+from typing import TYPE_CHECKING, List, Dict, Optional
 
 from .tagger import tag_content, is_relevant
-from .database import insert_post, post_exists
+from .database import insert_post, post_exists, get_refresh_candidates, update_scores
+from .run_report import current_report
+
+# praw is imported in init_reddit() so RSS-only runs don't pay for it
+if TYPE_CHECKING:
+    import praw
 
 
 # Target subreddits
@@ -22,9 +26,23 @@ SEARCH_KEYWORDS = [
     'due date', 'penalty', 'portal', 'error', 'compliance', 'filing'
 ]
 
+# Score refresh: posts younger than this are still gaining votes
+REFRESH_WINDOW_DAYS = 7
+
+# reddit.info() resolves up to 100 fullnames per API request
+INFO_BATCH_SIZE = 100
+
+# Reddit allows ~100 OAuth requests/minute; refresh paces itself below that
+# and leaves RATE_LIMIT_RESERVE requests of the current window for collection
+REFRESH_REQUESTS_PER_MINUTE = 60
+RATE_LIMIT_RESERVE = 100
 
-def init_reddit() -> praw.Reddit:
+
+def init_reddit() -> 'praw.Reddit':
     """Initialize Reddit API client."""
+    import praw
+    from dotenv import load_dotenv
+
     load_dotenv()
 
     client_id = os.getenv('REDDIT_CLIENT_ID')
@@ -44,84 +62,233 @@ def init_reddit() -> praw.Reddit:
     )
 
 
+def track_http(reddit: 'praw.Reddit', report, source: str):
+    """
+    Hook PRAW's underlying requests session to count API calls and bytes.
+    Returns the installed hook (or None if the session isn't reachable).
+    """
+    try:
+        session = reddit._core._requestor._http
+    except AttributeError:
+        return None
+
+    def on_response(response, *args, **kwargs):
+        report.count(source, api_calls=1, bytes_downloaded=len(response.content or b''))
+
+    session.hooks['response'].append(on_response)
+    return on_response
+
+
+def untrack_http(reddit: 'praw.Reddit', hook) -> None:
+    """Remove a hook installed by track_http."""
+    if hook is not None:
+        reddit._core._requestor._http.hooks['response'].remove(hook)
+
+
+def process_submission(
+    submission,
+    subreddit_name: str,
+    cutoff_date: datetime,
+    conn=None
+) -> Optional[bool]:
+    """
+    Dedup, tag and store a single submission.
+    Returns True if inserted, False if skipped, None if older than cutoff_date.
+    """
+    report = current_report()
+    source = f"r/{subreddit_name}"
+
+    created_time = datetime.fromtimestamp(submission.created_utc)
+
+    # Skip if too old
+    if created_time < cutoff_date:
+        return None
+
+    # Build post ID
+    post_id = f"reddit_{submission.id}"
+
+    # Skip if already in DB
+    with report.stage(source, 'dedup'):
+        exists = post_exists(post_id, conn=conn)
+    report.count(source, db_round_trips=1)
+    if exists:
+        return False
+
+    # Extract text
+    title = submission.title or ""
+    text = submission.selftext or ""
+
+    with report.stage(source, 'tagging'):
+        # Check relevance
+        relevant = is_relevant(title, text, min_tags=1)
+
+        # Tag the content
+        tags = tag_content(title, text) if relevant else []
+
+    if not relevant:
+        return False
+
+    # Insert into database
+    with report.stage(source, 'db_write'):
+        success = insert_post(
+            post_id=post_id,
+            source='Reddit',
+            title=title,
+            text=text,
+            author=str(submission.author) if submission.author else '[deleted]',
+            url=f"https://reddit.com{submission.permalink}",
+            score=submission.score,
+            created_at=created_time,
+            tags=tags,
+            subreddit=subreddit_name,
+            conn=conn
+        )
+    report.count(source, db_round_trips=1)
+    return success
+
+
 def collect_from_subreddit(
-    reddit: praw.Reddit,
+    reddit: 'praw.Reddit',
     subreddit_name: str,
     days_back: int = 14,
-    limit: int = 100
+    limit: int = 100,
+    since: Optional[datetime] = None,
+    conn=None
 ) -> Dict[str, int]:
     """
-    Collect posts from a single subreddit.
-    Returns stats: new, skipped, total
+    Collect posts from a single subreddit. Uses `conn` for DB access if given.
+    Returns stats: new, skipped, total, errors, and arrived (listed posts
+    created after `since`; all listed posts if not given)
     """
     subreddit = reddit.subreddit(subreddit_name)
     cutoff_date = datetime.now() - timedelta(days=days_back)
 
-    stats = {'new': 0, 'skipped': 0, 'total': 0}
+    stats = {'new': 0, 'skipped': 0, 'total': 0, 'arrived': 0, 'errors': 0}
+    report = current_report()
+    source = f"r/{subreddit_name}"
+    hook = track_http(reddit, report, source)
 
     try:
-        # Get recent posts (sort by new)
-        for submission in subreddit.new(limit=limit):
+        # Get recent posts (sort by new); listing pages are fetched lazily
+        for submission in report.timed_iter(source, 'fetch', subreddit.new(limit=limit)):
             stats['total'] += 1
+            if since is None or datetime.fromtimestamp(submission.created_utc) > since:
+                stats['arrived'] += 1
 
-            created_time = datetime.fromtimestamp(submission.created_utc)
-
-            # Skip if too old
-            if created_time < cutoff_date:
+            inserted = process_submission(submission, subreddit_name, cutoff_date, conn=conn)
+            if inserted is None:
                 continue
 
-            # Build post ID
-            post_id = f"reddit_{submission.id}"
-
-            # Skip if already in DB
-            if post_exists(post_id):
-                stats['skipped'] += 1
-                continue
-
-            # Extract text
-            title = submission.title or ""
-            text = submission.selftext or ""
-
-            # Check relevance
-            if not is_relevant(title, text, min_tags=1):
-                stats['skipped'] += 1
-                continue
-
-            # Tag the content
-            tags = tag_content(title, text)
-
-            # Insert into database
-            success = insert_post(
-                post_id=post_id,
-                source='Reddit',
-                title=title,
-                text=text,
-                author=str(submission.author) if submission.author else '[deleted]',
-                url=f"https://reddit.com{submission.permalink}",
-                score=submission.score,
-                created_at=created_time,
-                tags=tags,
-                subreddit=subreddit_name
-            )
-
-            if success:
+            if inserted:
                 stats['new'] += 1
             else:
                 stats['skipped'] += 1
 
     except Exception as e:
         print(f"Error collecting from r/{subreddit_name}: {e}")
+        stats['errors'] += 1
+    finally:
+        untrack_http(reddit, hook)
 
+    report.set_stats(source, stats)
     return stats
 
 
-def collect_reddit_posts(days_back: int = 14, limit_per_sub: int = 100) -> Dict[str, any]:
+def _rate_limit_remaining(reddit: 'praw.Reddit') -> Optional[float]:
+    """Requests left in Reddit's current rate-limit window, if known."""
+    try:
+        return reddit.auth.limits.get('remaining')
+    except AttributeError:
+        return None
+
+
+def refresh_scores(
+    reddit: 'praw.Reddit',
+    window_days: int = REFRESH_WINDOW_DAYS,
+    max_requests: Optional[int] = None,
+    requests_per_minute: float = REFRESH_REQUESTS_PER_MINUTE,
+    reserve: int = RATE_LIMIT_RESERVE
+) -> Dict[str, int]:
+    """
+    Refresh stored scores of Reddit posts still inside the engagement window.
+    Looks posts up 100 fullnames per request and writes changed scores back
+    in one batched UPDATE per request. Stops early when max_requests is spent
+    or the rate-limit window is down to `reserve` requests.
+    Returns stats: candidates, requests, updated
+    """
+    report = current_report()
+    source = 'reddit:refresh'
+    since = datetime.now() - timedelta(days=window_days)
+
+    with report.stage(source, 'db_read'):
+        current = {row['id']: row['score'] for row in get_refresh_candidates(since)}
+    report.count(source, db_round_trips=1)
+
+    stats = {'candidates': len(current), 'requests': 0, 'updated': 0}
+    interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+    post_ids = list(current)
+    last_request = None
+    hook = track_http(reddit, report, source)
+
+    try:
+        for start in range(0, len(post_ids), INFO_BATCH_SIZE):
+            if max_requests is not None and stats['requests'] >= max_requests:
+                print(f"  Refresh request budget ({max_requests}) spent, stopping")
+                break
+
+            remaining = _rate_limit_remaining(reddit)
+            if remaining is not None and remaining <= reserve:
+                print(f"  Only {remaining:.0f} requests left in rate-limit window, stopping refresh")
+                break
+
+            if last_request is not None:
+                wait = interval - (time.monotonic() - last_request)
+                if wait > 0:
+                    time.sleep(wait)
+
+            batch = post_ids[start:start + INFO_BATCH_SIZE]
+            fullnames = [f"t3_{post_id[len('reddit_'):]}" for post_id in batch]
+
+            last_request = time.monotonic()
+            with report.stage(source, 'fetch'):
+                submissions = list(reddit.info(fullnames=fullnames))
+            stats['requests'] += 1
+            if hook is None:
+                report.count(source, api_calls=1)
+
+            updates = []
+            for submission in submissions:
+                post_id = f"reddit_{submission.id}"
+                if current.get(post_id) != submission.score:
+                    updates.append((post_id, submission.score))
+
+            if updates:
+                with report.stage(source, 'db_write'):
+                    stats['updated'] += update_scores(updates)
+                report.count(source, db_round_trips=1)
+
+    except Exception as e:
+        print(f"Error refreshing Reddit scores: {e}")
+    finally:
+        untrack_http(reddit, hook)
+
+    report.set_stats(source, stats)
+    return stats
+
+
+def collect_reddit_posts(
+    days_back: int = 14,
+    limit_per_sub: int = 100,
+    refresh_window_days: int = 0
+) -> Dict[str, any]:
     """
     Main function to collect posts from all target subreddits.
+    If refresh_window_days > 0, also refreshes scores of posts that recent.
     Returns overall statistics.
     """
     print("Initializing Reddit API...")
-    reddit = init_reddit()
+    with current_report().stage('reddit', 'init'):
+        reddit = init_reddit()
 
     overall_stats = {
         'total_new': 0,
@@ -148,6 +315,13 @@ def collect_reddit_posts(days_back: int = 14, limit_per_sub: int = 100) -> Dict[
     print(f"  Skipped: {overall_stats['total_skipped']}")
     print(f"{'='*50}\n")
 
+    if refresh_window_days > 0:
+        print(f"Refreshing scores of posts from the last {refresh_window_days} days...")
+        refresh = refresh_scores(reddit, window_days=refresh_window_days)
+        print(f"  Candidates: {refresh['candidates']}, Requests: {refresh['requests']}, "
+              f"Updated: {refresh['updated']}\n")
+        overall_stats['refresh'] = refresh
+
     return overall_stats
 
 
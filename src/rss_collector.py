@@ -3,12 +3,16 @@ RSS feed collector for compliance news and updates.
 Collects from GSTN News and CAClubIndia Tax News.
 """
 from datetime import datetime, timedelta
-from typing import List, Dict
-import feedparser
+from itertools import islice
+from typing import List, Dict, Iterator, Tuple
+import urllib.request
+import xml.etree.ElementTree as ET
 import hashlib
 
+from .feed_stream import iter_entries, read_chunks
 from .tagger import tag_content, is_relevant
 from .database import insert_post, post_exists
+from .run_report import current_report
 
 
 # RSS feeds to monitor
@@ -18,6 +22,16 @@ RSS_FEEDS = {
     'SEBI': 'https://www.sebi.gov.in/sebirss.xml'
 }
 
+# Seconds to wait for a feed server before giving up
+FETCH_TIMEOUT = 30
+
+# Sent with feed requests (defined here so streaming fetches don't import feedparser)
+USER_AGENT = 'IndiaCompliancePainTracker/1.0'
+
+# Streaming mode stops reading a (newest-first) feed after this many
+# consecutive entries that are past the cutoff or already stored
+STALE_RUN_LIMIT = 3
+
 
 def generate_post_id(url: str, title: str) -> str:
     """Generate a unique post ID from URL and title."""
@@ -26,64 +40,168 @@ def generate_post_id(url: str, title: str) -> str:
     return f"rss_{hash_object.hexdigest()}"
 
 
+def open_feed(feed_url: str):
+    """Open an HTTP connection to a feed; returns the response object."""
+    request = urllib.request.Request(feed_url, headers={'User-Agent': USER_AGENT})
+    return urllib.request.urlopen(request, timeout=FETCH_TIMEOUT)
+
+
+def fetch_feed(feed_url: str) -> Tuple[bytes, Dict[str, str]]:
+    """
+    Download a feed document.
+    Returns the raw body and lowercased response headers for feedparser.
+    """
+    with open_feed(feed_url) as response:
+        body = response.read()
+        headers = {k.lower(): v for k, v in response.headers.items()}
+        # Lets feedparser resolve relative links against the final URL
+        headers.setdefault('content-location', response.geturl())
+    return body, headers
+
+
+def _feedparser_entries(feed_name: str, feed_url: str, report) -> Iterator[Dict]:
+    """Download the whole feed, parse it with feedparser and yield entry fields."""
+    import feedparser
+
+    with report.stage(feed_name, 'fetch'):
+        body, headers = fetch_feed(feed_url)
+    report.count(feed_name, api_calls=1, bytes_downloaded=len(body))
+
+    with report.stage(feed_name, 'parse'):
+        feed = feedparser.parse(body, response_headers=headers)
+
+    if feed.bozo:
+        print(f"  Warning: Feed parsing issue for {feed_name}")
+
+    for entry in feed.entries:
+        # Extract published date
+        published = None
+        if hasattr(entry, 'published_parsed') and entry.published_parsed:
+            published = datetime(*entry.published_parsed[:6])
+        elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
+            published = datetime(*entry.updated_parsed[:6])
+
+        yield {
+            'title': entry.get('title', ''),
+            'summary': entry.get('summary', '') or entry.get('description', ''),
+            'link': entry.get('link', ''),
+            'author': entry.get('author'),
+            'published': published
+        }
+
+
+def _streaming_entries(feed_name: str, feed_url: str, report) -> Iterator[Dict]:
+    """
+    Read the feed incrementally and yield entry fields as they are parsed.
+    Closing the generator early stops the download.
+    """
+    stages = report.source(feed_name)['stages']
+    # Connecting and waiting for the headers is network time too
+    with report.stage(feed_name, 'fetch'):
+        response = open_feed(feed_url)
+    with response:
+        report.count(feed_name, api_calls=1)
+
+        def chunks():
+            for chunk in read_chunks(response):
+                report.count(feed_name, bytes_downloaded=len(chunk))
+                yield chunk
+
+        fetch_before = stages.get('fetch', 0.0)
+        parse_before = stages.get('parse', 0.0)
+        try:
+            # Relative links resolve against the final URL, as with feedparser
+            entries = iter_entries(report.timed_iter(feed_name, 'fetch', chunks()), response.geturl())
+            yield from report.timed_iter(feed_name, 'parse', entries)
+        finally:
+            # Chunk reads happen inside the parse iterator; don't count them twice
+            fetched = stages.get('fetch', 0.0) - fetch_before
+            stages['parse'] = max(parse_before, stages.get('parse', 0.0) - fetched)
+
+
+def _feed_entries(feed_name: str, feed_url: str, stream: bool, report) -> Iterator[Dict]:
+    """
+    Yield entry fields, streaming if requested and falling back to feedparser.
+    After a streaming failure, entries the stream already yielded are skipped.
+    """
+    yielded = 0
+    if stream:
+        try:
+            for entry in _streaming_entries(feed_name, feed_url, report):
+                yielded += 1
+                yield entry
+            return
+        except ET.ParseError as e:
+            print(f"  Warning: Streaming parse failed for {feed_name} ({e}), using feedparser")
+    yield from islice(_feedparser_entries(feed_name, feed_url, report), yielded, None)
+
+
 def collect_from_feed(
     feed_name: str,
     feed_url: str,
-    days_back: int = 14
+    days_back: int = 14,
+    stream: bool = True,
+    conn=None
 ) -> Dict[str, int]:
     """
     Collect entries from a single RSS feed.
+    In streaming mode, reading stops once entries are past the cutoff or
+    already stored (feeds are newest-first). Uses `conn` for DB access if given.
     Returns stats: new, skipped, total
     """
     stats = {'new': 0, 'skipped': 0, 'total': 0, 'errors': 0}
+    report = current_report()
+    cutoff_date = datetime.now() - timedelta(days=days_back)
+    stale_run = 0
 
     try:
         print(f"  Fetching {feed_name}...")
-        feed = feedparser.parse(feed_url)
-
-        if feed.bozo:
-            print(f"  Warning: Feed parsing issue for {feed_name}")
+        entries = _feed_entries(feed_name, feed_url, stream, report)
 
-        cutoff_date = datetime.now() - timedelta(days=days_back)
+        for entry in entries:
+            if stream and stale_run >= STALE_RUN_LIMIT:
+                entries.close()
+                break
 
-        for entry in feed.entries:
             stats['total'] += 1
 
-            # Extract published date
-            published = None
-            if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                published = datetime(*entry.published_parsed[:6])
-            elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
-                published = datetime(*entry.updated_parsed[:6])
-            else:
-                # If no date, assume it's recent
-                published = datetime.now()
+            # If no date, assume it's recent
+            published = entry['published'] or datetime.now()
 
             # Skip if too old
             if published < cutoff_date:
+                stale_run += 1
                 continue
 
             # Extract fields
-            title = entry.get('title', '').strip()
-            summary = entry.get('summary', '') or entry.get('description', '')
-            link = entry.get('link', '')
+            title = entry['title'].strip()
+            summary = entry['summary']
+            link = entry['link']
 
             # Generate unique ID
             post_id = generate_post_id(link, title)
 
             # Skip if already in DB
-            if post_exists(post_id):
+            with report.stage(feed_name, 'dedup'):
+                exists = post_exists(post_id, conn=conn)
+            report.count(feed_name, db_round_trips=1)
+            if exists:
+                stale_run += 1
                 stats['skipped'] += 1
                 continue
+            stale_run = 0
+
+            with report.stage(feed_name, 'tagging'):
+                # Check relevance
+                relevant = is_relevant(title, summary, min_tags=1)
 
-            # Check relevance
-            if not is_relevant(title, summary, min_tags=1):
+                # Tag the content
+                tags = tag_content(title, summary) if relevant else []
+
+            if not relevant:
                 stats['skipped'] += 1
                 continue
 
-            # Tag the content
-            tags = tag_content(title, summary)
-
             # Add SEBI-specific tags based on URL path
             if feed_name == 'SEBI':
                 tags.append('SEBI')  # Always tag SEBI posts with SEBI
@@ -103,21 +221,24 @@ def collect_from_feed(
                 tags = sorted(list(set(tags)))
 
             # Extract author
-            author = entry.get('author', feed_name)
+            author = entry['author'] or feed_name
 
             # Insert into database
-            success = insert_post(
-                post_id=post_id,
-                source=feed_name,
-                title=title,
-                text=summary,
-                author=author,
-                url=link,
-                score=0,  # RSS feeds don't have scores
-                created_at=published,
-                tags=tags,
-                subreddit=None
-            )
+            with report.stage(feed_name, 'db_write'):
+                success = insert_post(
+                    post_id=post_id,
+                    source=feed_name,
+                    title=title,
+                    text=summary,
+                    author=author,
+                    url=link,
+                    score=0,  # RSS feeds don't have scores
+                    created_at=published,
+                    tags=tags,
+                    subreddit=None,
+                    conn=conn
+                )
+            report.count(feed_name, db_round_trips=1)
 
             if success:
                 stats['new'] += 1
@@ -128,10 +249,11 @@ def collect_from_feed(
         print(f"  Error collecting from {feed_name}: {e}")
         stats['errors'] += 1
 
+    report.set_stats(feed_name, stats)
     return stats
 
 
-def collect_rss_feeds(days_back: int = 14) -> Dict[str, any]:
+def collect_rss_feeds(days_back: int = 14, stream: bool = True) -> Dict[str, any]:
     """
     Main function to collect from all RSS feeds.
     Returns overall statistics.
@@ -146,7 +268,7 @@ def collect_rss_feeds(days_back: int = 14) -> Dict[str, any]:
     }
 
     for feed_name, feed_url in RSS_FEEDS.items():
-        stats = collect_from_feed(feed_name, feed_url, days_back)
+        stats = collect_from_feed(feed_name, feed_url, days_back, stream=stream)
 
         print(f"  {feed_name}: Processed: {stats['total']}, New: {stats['new']}, Skipped: {stats['skipped']}")
 
@@ -0,0 +1,134 @@
+"""
+Per-source, per-stage instrumentation for collection runs.
+Collectors record timings and counters here; collect.py writes the JSON report.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, Optional
+
+
+# Stage names used by the collectors, in pipeline order
+STAGES = ['init', 'fetch', 'parse', 'dedup', 'tagging', 'db_read', 'db_write']
+
+
+class RunReport:
+    """Accumulates timings and counters for one collection run."""
+
+    def __init__(self):
+        self.started_at = datetime.now()
+        self.finished_at: Optional[datetime] = None
+        self.sources: Dict[str, Dict] = {}
+        self.extra: Dict = {}
+        # Scheduled polls run collectors from worker threads
+        self._lock = threading.Lock()
+
+    def source(self, name: str) -> Dict:
+        """Return the (lazily created) record for a source."""
+        with self._lock:
+            return self._source(name)
+
+    def _source(self, name: str) -> Dict:
+        """Record for a source; caller holds the lock."""
+        if name not in self.sources:
+            self.sources[name] = {
+                'stages': {},
+                'api_calls': 0,
+                'bytes_downloaded': 0,
+                'db_round_trips': 0,
+                'stats': {}
+            }
+        return self.sources[name]
+
+    def add_time(self, source: str, stage: str, seconds: float) -> None:
+        """Add elapsed seconds to a source's stage."""
+        with self._lock:
+            stages = self._source(source)['stages']
+            stages[stage] = stages.get(stage, 0.0) + seconds
+
+    def count(self, source: str, **counters: int) -> None:
+        """Increment counters (api_calls, bytes_downloaded, db_round_trips)."""
+        with self._lock:
+            record = self._source(source)
+            for key, value in counters.items():
+                record[key] = record.get(key, 0) + value
+
+    @contextmanager
+    def stage(self, source: str, stage: str) -> Iterator[None]:
+        """Time the enclosed block as `stage` of `source`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(source, stage, time.perf_counter() - start)
+
+    def timed_iter(self, source: str, stage: str, iterable: Iterable) -> Iterator:
+        """Yield from iterable, charging the time spent in next() to `stage`."""
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.add_time(source, stage, time.perf_counter() - start)
+                return
+            self.add_time(source, stage, time.perf_counter() - start)
+            yield item
+
+    def set_stats(self, source: str, stats: Dict) -> None:
+        """Attach the collector's new/skipped/total stats to a source."""
+        self.source(source)['stats'] = dict(stats)
+
+    def finish(self) -> None:
+        """Mark the run as finished."""
+        self.finished_at = datetime.now()
+
+    def to_dict(self) -> Dict:
+        """Build the JSON-serialisable report."""
+        finished_at = self.finished_at or datetime.now()
+        stage_totals: Dict[str, float] = {}
+        sources = {}
+
+        for name, record in self.sources.items():
+            stages = {k: round(v, 6) for k, v in record['stages'].items()}
+            for stage, seconds in record['stages'].items():
+                stage_totals[stage] = stage_totals.get(stage, 0.0) + seconds
+            sources[name] = dict(record, stages=stages, total_seconds=round(sum(record['stages'].values()), 6))
+
+        return {
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'finished_at': finished_at.isoformat(timespec='seconds'),
+            'wall_seconds': round((finished_at - self.started_at).total_seconds(), 3),
+            'pid': os.getpid(),
+            'totals': {
+                'stages': {k: round(v, 6) for k, v in stage_totals.items()},
+                'api_calls': sum(r['api_calls'] for r in self.sources.values()),
+                'bytes_downloaded': sum(r['bytes_downloaded'] for r in self.sources.values()),
+                'db_round_trips': sum(r['db_round_trips'] for r in self.sources.values())
+            },
+            'sources': sources,
+            **self.extra
+        }
+
+    def write(self, path: str) -> None:
+        """Write the report as JSON."""
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+
+_current_report = RunReport()
+
+
+def current_report() -> RunReport:
+    """Return the report collectors record into."""
+    return _current_report
+
+
+def start_report() -> RunReport:
+    """Start a fresh report for a new run and return it."""
+    global _current_report
+    _current_report = RunReport()
+    return _current_report
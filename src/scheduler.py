@@ -0,0 +1,297 @@
+"""
+Adaptive per-source polling scheduler.
+Polls each registered source when it is due and sets its next poll time
+from the observed rate of new posts, so quiet feeds are fetched rarely.
+"""
+import random
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from .database import (
+    DB_PATH, SNAPSHOT_INTERVAL, connect, init_db, backfill_signatures, backfill_spikes, backfill_cooccurrence,
+    add_source, get_sources, update_source, publish_snapshot
+)
+from .reddit_collector import TARGET_SUBREDDITS, init_reddit, collect_from_subreddit
+from .rss_collector import RSS_FEEDS, collect_from_feed
+
+
+# Aim for about this many new posts per poll
+TARGET_NEW_PER_POLL = 5
+
+# Weight of the latest observation in the rate/yield moving averages
+EWMA_ALPHA = 0.3
+
+# Interval bounds for newly registered sources (seconds)
+DEFAULT_MIN_INTERVAL = 10 * 60
+DEFAULT_MAX_INTERVAL = 24 * 60 * 60
+
+# Growth factor for sources that produced nothing new
+IDLE_BACKOFF = 2.0
+
+# Next poll times are spread by +/- this fraction of the interval
+JITTER = 0.1
+
+# Reddit listing size per poll scales with the expected backlog
+MIN_REDDIT_LIMIT = 100
+MAX_REDDIT_LIMIT = 1000
+
+# Below this share of relevant arrivals the arrival rate estimate is too
+# noisy to size a listing from; the full listing is fetched instead
+MIN_YIELD_FOR_LIMIT = 0.05
+
+# Worker threads polling sources concurrently
+MAX_WORKERS = 4
+
+# Collection window for scheduled polls (days)
+DAYS_BACK = 180
+
+
+def seed_sources(db_path: str = DB_PATH) -> int:
+    """Register the built-in subreddits and RSS feeds. Returns how many were new."""
+    added = 0
+    for name in TARGET_SUBREDDITS:
+        added += add_source('reddit', name, min_interval=DEFAULT_MIN_INTERVAL,
+                            max_interval=DEFAULT_MAX_INTERVAL, db_path=db_path)
+    for name, url in RSS_FEEDS.items():
+        added += add_source('rss', name, url, min_interval=DEFAULT_MIN_INTERVAL,
+                            max_interval=DEFAULT_MAX_INTERVAL, db_path=db_path)
+    return added
+
+
+def _parse_time(value) -> Optional[datetime]:
+    """DATETIME column value (ISO string) to datetime."""
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
+
+
+def plan_next_poll(
+    source: Dict,
+    new_posts: int,
+    processed: int,
+    now: datetime,
+    rng: random.Random = random
+) -> Dict:
+    """
+    Update rate/yield estimates from one poll and choose the next poll time.
+    `processed` counts the posts that arrived since the last poll, so yield
+    is the share of arrivals that were relevant and new.
+    Returns the fields to store on the source.
+    """
+    last_polled = _parse_time(source.get('last_polled_at'))
+    min_interval = source['min_interval']
+    max_interval = source['max_interval']
+    previous_interval = source.get('interval') or min_interval
+    observed_yield = new_posts / processed if processed else 0.0
+
+    if last_polled is None:
+        # First poll backfills the whole window, which says nothing about the
+        # arrival rate; measure it from the next poll
+        rate = None
+        yield_ratio = observed_yield
+        interval = min_interval
+    else:
+        # New posts per hour since the previous poll
+        elapsed = max((now - last_polled).total_seconds(), 1.0)
+        observed_rate = new_posts / (elapsed / 3600.0)
+
+        if source.get('rate') is None:
+            rate = observed_rate
+            yield_ratio = observed_yield
+        else:
+            rate = EWMA_ALPHA * observed_rate + (1 - EWMA_ALPHA) * source['rate']
+            yield_ratio = EWMA_ALPHA * observed_yield + (1 - EWMA_ALPHA) * (source.get('yield_ratio') or 0.0)
+
+        if new_posts == 0 and rate * previous_interval / 3600.0 < 1:
+            # Nothing arrived and little expected: back off geometrically
+            interval = previous_interval * IDLE_BACKOFF
+        else:
+            interval = TARGET_NEW_PER_POLL / max(rate, 1e-6) * 3600.0
+        interval = int(min(max(interval, min_interval), max_interval))
+
+    jittered = interval * (1 + rng.uniform(-JITTER, JITTER))
+    return {
+        'interval': interval,
+        'rate': rate,
+        'yield_ratio': yield_ratio,
+        'last_polled_at': now,
+        'next_poll_at': now + timedelta(seconds=jittered),
+        'polls': (source.get('polls') or 0) + 1,
+        'last_new': new_posts,
+        'last_error': None
+    }
+
+
+def reddit_limit(source: Dict, now: datetime) -> int:
+    """Listing size for a subreddit poll: about twice the expected backlog."""
+    last_polled = _parse_time(source.get('last_polled_at'))
+    yield_ratio = source.get('yield_ratio') or 0.0
+    if not last_polled or source.get('rate') is None or yield_ratio < MIN_YIELD_FOR_LIMIT:
+        return MAX_REDDIT_LIMIT
+    # /new lists every arrival, not just relevant ones, and is newest-first,
+    # so the listing has to reach back to the last poll at the raw arrival rate
+    hours = (now - last_polled).total_seconds() / 3600.0
+    expected = source['rate'] / yield_ratio * hours
+    return int(min(max(2 * expected, MIN_REDDIT_LIMIT), MAX_REDDIT_LIMIT))
+
+
+class Scheduler:
+    """Runs due sources through a bounded worker pool."""
+
+    def __init__(
+        self,
+        db_path: str = DB_PATH,
+        max_workers: int = MAX_WORKERS,
+        days_back: int = DAYS_BACK,
+        kind: Optional[str] = None
+    ):
+        self.db_path = db_path
+        self.kind = kind
+        self.max_workers = max_workers
+        self.days_back = days_back
+        self.stop_event = threading.Event()
+        # PRAW clients aren't thread-safe; each worker gets its own. The pool
+        # lives as long as the scheduler so clients are reused across passes.
+        self._local = threading.local()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+
+    def close(self) -> None:
+        """Wait for running polls and stop the worker threads."""
+        self._pool.shutdown(wait=True)
+
+    def _reddit(self):
+        """Per-thread Reddit client."""
+        if not hasattr(self._local, 'reddit'):
+            self._local.reddit = init_reddit()
+        return self._local.reddit
+
+    def poll(self, source: Dict) -> Dict:
+        """Poll one source and store its next poll time. Returns collector stats."""
+        now = datetime.now()
+        conn = connect(self.db_path)
+        try:
+            if source['kind'] == 'reddit':
+                stats = collect_from_subreddit(
+                    self._reddit(), source['name'],
+                    days_back=self.days_back, limit=reddit_limit(source, now),
+                    since=_parse_time(source.get('last_polled_at')), conn=conn
+                )
+            elif source['kind'] == 'rss':
+                stats = collect_from_feed(source['name'], source['url'], days_back=self.days_back, conn=conn)
+            else:
+                raise ValueError(f"Unknown source kind: {source['kind']}")
+            if stats.get('errors'):
+                # Collectors log and count their errors instead of raising
+                raise RuntimeError("collection failed (see error above)")
+        except Exception as e:
+            # Keep the current estimates; retry after the current interval
+            print(f"  Error polling {source['key']}: {e}")
+            retry = source.get('interval') or source['min_interval']
+            update_source(source['key'], {
+                'last_error': str(e),
+                'next_poll_at': now + timedelta(seconds=retry)
+            }, db_path=self.db_path)
+            return {'new': 0, 'total': 0, 'error': str(e)}
+        finally:
+            conn.close()
+
+        plan = plan_next_poll(source, stats['new'], stats.get('arrived', stats['total']), now)
+        update_source(source['key'], plan, db_path=self.db_path)
+        print(f"  {source['key']}: {stats['new']} new, next poll in {plan['interval'] // 60} min")
+        return stats
+
+    def run_due(self, now: Optional[datetime] = None) -> List[Dict]:
+        """
+        Poll every source that is due now, then replay the spike state if
+        posts were stored that it couldn't count in arrival order (first
+        pass, new sources). Returns per-source stats.
+        """
+        due = get_sources(due_before=now or datetime.now(), kind=self.kind, db_path=self.db_path)
+        if not due:
+            return []
+        results = list(self._pool.map(self.poll, due))
+        if any(stats['new'] for stats in results):
+            replayed = backfill_spikes(self.db_path)
+            if replayed:
+                print(f"Replayed {replayed} posts into the spike detector.")
+        return results
+
+    def seconds_until_next(self) -> Optional[float]:
+        """Seconds until the next source is due (None if no sources)."""
+        sources = get_sources(kind=self.kind, db_path=self.db_path)
+        if not sources:
+            return None
+        next_poll = _parse_time(sources[0]['next_poll_at'])
+        if next_poll is None:
+            return 0.0
+        return max((next_poll - datetime.now()).total_seconds(), 0.0)
+
+    def run_forever(self, max_sleep: float = 60.0, snapshot: bool = True) -> int:
+        """
+        Poll due sources until stop_event is set, republishing the dashboard
+        snapshot at most every SNAPSHOT_INTERVAL if `snapshot`.
+        Returns new posts collected.
+        """
+        total_new = 0
+        published_new = 0
+        last_snapshot = time.monotonic()
+        while not self.stop_event.is_set():
+            total_new += sum(stats['new'] for stats in self.run_due())
+            if snapshot and total_new != published_new and time.monotonic() - last_snapshot >= SNAPSHOT_INTERVAL:
+                publish_snapshot(self.db_path)
+                published_new = total_new
+                last_snapshot = time.monotonic()
+            wait = self.seconds_until_next()
+            self.stop_event.wait(min(wait if wait is not None else max_sleep, max_sleep))
+        return total_new
+
+
+def run_scheduler(
+    once: bool = False,
+    max_workers: int = MAX_WORKERS,
+    kind: Optional[str] = None,
+    snapshot: bool = True,
+    db_path: str = DB_PATH
+) -> int:
+    """
+    Poll sources as they come due, until SIGTERM/SIGINT (or after one pass
+    over the due sources if `once`). `kind` limits polling to 'reddit' or
+    'rss' sources; `snapshot` republishes the dashboard snapshot while running.
+    Returns new posts collected.
+    """
+    print("Initializing database...")
+    init_db(db_path)
+    backfill_signatures(db_path)
+    backfill_spikes(db_path)
+    backfill_cooccurrence(db_path)
+    added = seed_sources(db_path)
+    if added:
+        print(f"Registered {added} new sources.")
+
+    scheduler = Scheduler(db_path=db_path, max_workers=max_workers, kind=kind)
+
+    if once:
+        print("Polling due sources...")
+        try:
+            return sum(stats['new'] for stats in scheduler.run_due())
+        finally:
+            scheduler.close()
+
+    def request_stop(signum=None, frame=None):
+        print("Shutdown requested, finishing current polls...")
+        scheduler.stop_event.set()
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    print(f"Scheduling {len(get_sources(kind=kind, db_path=db_path))} sources (Ctrl+C to stop)...")
+    try:
+        total_new = scheduler.run_forever(snapshot=snapshot)
+    finally:
+        scheduler.close()
+    print(f"Scheduler stopped. New posts: {total_new}")
+    return total_new
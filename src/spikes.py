@@ -0,0 +1,256 @@
+"""
+Streaming spike detection for tag and source activity.
+Keeps an exponentially weighted mean and variance of daily post counts per
+(tag, source), updated in O(1) per stored post, and flags recent days whose
+counts are far above that baseline.
+"""
+import json
+import math
+import sqlite3
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Tuple, Union
+
+
+# Weight of each new day in the baseline (roughly a 10-day memory)
+ALPHA = 0.1
+
+# Daily counts kept per key before they are folded into the baseline. Posts
+# up to this many days older than the newest one seen are still counted
+# (collectors store newest first); older ones are counted as late and skipped
+# until the next backfill replays every post in date order.
+# It also keeps the days get_spikes tests out of the baseline they are tested against.
+RECENT_DAYS = 7
+
+# Days folded into the baseline before a key can raise alerts
+MIN_BASELINE_DAYS = 14
+
+# Alert when the window's count is this many standard deviations above the baseline...
+Z_THRESHOLD = 3.0
+
+# ...and at least this many posts
+MIN_SPIKE_COUNT = 3
+
+# Daily counts are roughly Poisson: the variance used is at least the mean,
+# and at least this, so rare tags don't alert on two or three posts
+MIN_VARIANCE = 1.0
+
+# Quiet days folded one by one after a gap; beyond this the baseline has decayed to ~0
+MAX_GAP_DAYS = 100
+
+# Stands for "all tags" / "all sources" in a key
+ALL = '*'
+
+# collector_state key recording when the state was built (database.backfill_spikes)
+BUILT_KEY = "spikes:built_at"
+
+
+def create_tables(cursor: sqlite3.Cursor) -> None:
+    """Create the per-(tag, source) detector state table."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS spike_state (
+            tag TEXT NOT NULL,
+            source TEXT NOT NULL,
+            day TEXT NOT NULL,
+            recent TEXT NOT NULL,
+            mean REAL NOT NULL,
+            var REAL NOT NULL,
+            days INTEGER NOT NULL,
+            late INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (tag, source)
+        )
+    """)
+
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_spike_state_day ON spike_state(day)
+    """)
+
+
+def post_day(created_at: Union[datetime, str]) -> date:
+    """Calendar day of a post's created_at (datetime or stored ISO text)."""
+    if isinstance(created_at, datetime):
+        return created_at.date()
+    return date.fromisoformat(str(created_at)[:10])
+
+
+def post_keys(source: str, tags: Iterable[str]) -> List[Tuple[str, str]]:
+    """
+    Keys a post counts towards: each of its tags in its source and across
+    all sources, plus the source's and the overall post volume.
+    """
+    keys = [(ALL, source), (ALL, ALL)]
+    for tag in sorted(set(tags)):
+        keys.append((tag, source))
+        keys.append((tag, ALL))
+    return keys
+
+
+def new_state(day: date) -> Dict:
+    """State of a key whose first post is on `day`."""
+    return {'day': day, 'recent': [0] * RECENT_DAYS, 'mean': 0.0, 'var': 0.0, 'days': 0, 'late': 0}
+
+
+def _fold(state: Dict, count: int) -> None:
+    """Fold one finished day's count into the EWMA mean and variance."""
+    diff = count - state['mean']
+    increment = ALPHA * diff
+    state['mean'] += increment
+    state['var'] = (1 - ALPHA) * (state['var'] + diff * increment)
+    state['days'] += 1
+
+
+def observe(state: Dict, day: date) -> bool:
+    """
+    Count one post on `day`. Days that drop out of the recent window are
+    folded into the baseline. Returns False for a post too late to count.
+    """
+    shift = (day - state['day']).days
+    recent = state['recent']
+
+    if shift > 0:
+        for count in recent[:shift]:
+            _fold(state, count)
+        # Days with no posts at all between the old window and the new one
+        gap = shift - RECENT_DAYS
+        if gap > 0:
+            for _ in range(min(gap, MAX_GAP_DAYS)):
+                _fold(state, 0)
+            state['days'] += max(gap - MAX_GAP_DAYS, 0)
+        recent = state['recent'] = (recent[shift:] + [0] * shift)[-RECENT_DAYS:]
+        state['day'] = day
+        shift = 0
+
+    if shift <= -RECENT_DAYS:
+        state['late'] += 1
+        return False
+
+    recent[RECENT_DAYS - 1 + shift] += 1
+    return True
+
+
+def load_states(cursor: sqlite3.Cursor, keys: List[Tuple[str, str]]) -> Dict[Tuple[str, str], Dict]:
+    """Stored states of `keys` (primary-key lookups); missing keys are left out."""
+    states = {}
+    for key in keys:
+        row = cursor.execute("""
+            SELECT tag, source, day, recent, mean, var, days, late FROM spike_state
+            WHERE tag = ? AND source = ?
+        """, key).fetchone()
+        if row:
+            states[key] = state_from_row(row)
+    return states
+
+
+def state_from_row(row: Tuple) -> Dict:
+    """State dict from a spike_state row."""
+    return {
+        'day': date.fromisoformat(row[2]),
+        'recent': json.loads(row[3]),
+        'mean': row[4],
+        'var': row[5],
+        'days': row[6],
+        'late': row[7]
+    }
+
+
+def save_states(cursor: sqlite3.Cursor, states: Dict[Tuple[str, str], Dict]) -> None:
+    """Insert or replace the given states."""
+    cursor.executemany("""
+        INSERT OR REPLACE INTO spike_state (tag, source, day, recent, mean, var, days, late)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """, [
+        (tag, source, state['day'].isoformat(), json.dumps(state['recent']),
+         state['mean'], state['var'], state['days'], state['late'])
+        for (tag, source), state in states.items()
+    ])
+
+
+def has_late(cursor: sqlite3.Cursor) -> bool:
+    """Whether any key has skipped late posts since the state was built."""
+    return cursor.execute("SELECT 1 FROM spike_state WHERE late > 0 LIMIT 1").fetchone() is not None
+
+
+def register_post(
+    cursor: sqlite3.Cursor,
+    source: str,
+    tags: Iterable[str],
+    created_at: Union[datetime, str]
+) -> int:
+    """
+    Count a newly stored post towards its keys' states. Only called once
+    the state has been built by a backfill (database.insert_post checks
+    BUILT_KEY), which replays posts stored before then in order.
+    Returns the number of keys updated.
+    """
+    day = post_day(created_at)
+    keys = post_keys(source, tags)
+    states = load_states(cursor, keys)
+
+    for key in keys:
+        state = states.get(key)
+        if state is None:
+            state = states[key] = new_state(day)
+        observe(state, day)
+
+    save_states(cursor, states)
+    return len(states)
+
+
+def replay(rows: Iterable[Tuple], states: Dict[Tuple[str, str], Dict]) -> int:
+    """
+    Count (source, tags JSON, created_at) rows, oldest first, into in-memory
+    states. Returns the number of rows.
+    """
+    replayed = 0
+    for source, tags, created_at in rows:
+        day = post_day(created_at)
+        for key in post_keys(source, json.loads(tags) if tags else []):
+            state = states.get(key)
+            if state is None:
+                state = states[key] = new_state(day)
+            observe(state, day)
+        replayed += 1
+    return replayed
+
+
+def find_spikes(
+    states: Dict[Tuple[str, str], Dict],
+    today: date,
+    window: int = 1,
+    z_threshold: float = Z_THRESHOLD,
+    min_count: int = MIN_SPIKE_COUNT
+) -> List[Dict]:
+    """
+    Keys whose post count over the `window` days ending `today` is at least
+    z_threshold standard deviations above their baseline, highest first.
+    """
+    if not 1 <= window <= RECENT_DAYS:
+        raise ValueError(f"window must be between 1 and {RECENT_DAYS} days")
+
+    spikes = []
+    for (tag, source), state in states.items():
+        if state['days'] < MIN_BASELINE_DAYS:
+            continue
+        # recent[i] counts the day (RECENT_DAYS - 1 - i) days before state['day']
+        offset = (today - state['day']).days
+        observed = sum(
+            count for i, count in enumerate(state['recent'])
+            if 0 <= offset + RECENT_DAYS - 1 - i < window
+        )
+        if observed < min_count:
+            continue
+
+        expected = state['mean'] * window
+        std = math.sqrt(max(state['var'], state['mean'], MIN_VARIANCE) * window)
+        z = (observed - expected) / std
+        if z >= z_threshold:
+            spikes.append({
+                'tag': tag,
+                'source': source,
+                'window': window,
+                'observed': observed,
+                'expected': round(expected, 2),
+                'zscore': round(z, 2)
+            })
+
+    spikes.sort(key=lambda spike: spike['zscore'], reverse=True)
+    return spikes
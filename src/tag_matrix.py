@@ -0,0 +1,68 @@
+"""
+Multi-hot tag matrix for fast dashboard filtering and counting.
+One boolean row per post and one column per tag, so tag filters and
+counts are column reductions instead of per-row Python loops.
+"""
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def build_tag_matrix(tag_lists: Sequence[Iterable[str]]) -> Tuple[np.ndarray, List[str]]:
+    """
+    Build a posts x tags boolean matrix from each post's tag list.
+    Returns the matrix and its column vocabulary (sorted tag names).
+    """
+    vocab = sorted({tag for tags in tag_lists for tag in tags})
+    column = {tag: i for i, tag in enumerate(vocab)}
+
+    lengths = np.fromiter((len(tags) for tags in tag_lists), dtype=np.int64, count=len(tag_lists))
+    cols = np.fromiter(
+        (column[tag] for tags in tag_lists for tag in tags),
+        dtype=np.int64, count=int(lengths.sum())
+    )
+    rows = np.repeat(np.arange(len(tag_lists)), lengths)
+
+    matrix = np.zeros((len(tag_lists), len(vocab)), dtype=bool)
+    matrix[rows, cols] = True
+    return matrix, vocab
+
+
+def _columns(vocab: List[str], tags: Iterable[str]) -> List[int]:
+    """Column indices of the tags present in the vocabulary."""
+    index = {tag: i for i, tag in enumerate(vocab)}
+    return [index[tag] for tag in tags if tag in index]
+
+
+def tag_mask(matrix: np.ndarray, vocab: List[str], tags: Sequence[str], match_all: bool = False) -> np.ndarray:
+    """
+    Boolean row mask of posts having any (or, with match_all, every) of `tags`.
+    Tags missing from the vocabulary match no post.
+    """
+    tags = {tag for tag in tags if tag}
+    if not tags or (match_all and not tags.issubset(vocab)):
+        return np.zeros(matrix.shape[0], dtype=bool)
+    columns = _columns(vocab, sorted(tags))
+    if match_all:
+        return matrix[:, columns].all(axis=1)
+    return matrix[:, columns].any(axis=1)
+
+
+def tag_counts(matrix: np.ndarray, vocab: List[str], rows: Optional[np.ndarray] = None) -> Dict[str, int]:
+    """Number of posts per tag, optionally over a subset of rows (mask or indices)."""
+    selected = matrix if rows is None else matrix[rows]
+    return dict(zip(vocab, selected.sum(axis=0).tolist()))
+
+
+def tag_share(
+    matrix: np.ndarray,
+    vocab: List[str],
+    tags: Iterable[str],
+    rows: Optional[np.ndarray] = None
+) -> float:
+    """Fraction of all tag assignments (in `rows`) that are one of `tags`."""
+    selected = matrix if rows is None else matrix[rows]
+    total = int(selected.sum())
+    if not total:
+        return 0.0
+    return int(selected[:, _columns(vocab, tags)].sum()) / total